@@ -37,26 +37,173 @@
 #
 
 import sys
-import time
+import queue
+from collections import deque
 
 from PySide6.QtCore import (QMutex, QThread, QLoggingCategory,
                             qCDebug, qCWarning, Signal)
 
 import math
+from functools import lru_cache
 
 # Both numpy and scipy have real FFT functions. Their CPU load is high but numpy
-# is much higher than scpipy, though the result looks to have nicer resolution.
+# is much higher than scpipy, so use scipy. It can use multiple worker threads
+# for one transform and keeps the setup for a transform size between calls.
 # The rfft funcion in numpy and in scipy both provide Hermitian symmetric
 # output, despite what the docs say. The result size/length is N when the number
 # frequencies is (N / 2) + 1. So, we have to slice the output FFT bins in both
 # cases.
 import numpy as np
-#from scipy.fft import rfft, rfftfreq
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.fft import rfft, next_fast_len
 from scipy import signal
 
 import pyaudio
 
 
+# Lookups from the names used in the Settings dialog UI and from pyaudio sample
+# format codes. They are used when settings change rather than per sample but
+# save walking long chains of string comparisons each time.
+
+# Window functions by the name used in the Settings dialog UI. Each is called
+# with the number of samples the window is to be applied to
+_WINDOW_FNS = {
+    "Boxcar": signal.windows.boxcar,
+    "Triangular": signal.windows.triang,
+    "Blackman": signal.windows.blackman,
+    "Hamming": signal.windows.hamming,
+    "Hann": signal.windows.hann,
+    "Bartlett": signal.windows.bartlett,
+    "Flat top": signal.windows.flattop,
+    "Parzen": signal.windows.parzen,
+    "Bohman": signal.windows.bohman,
+    "Blackman-Harris": signal.windows.blackmanharris,
+    "Nuttall": signal.windows.nuttall,
+    "Bartlett-Hann": signal.windows.barthann,
+    "Cosine": signal.windows.cosine,
+    "Exponential": signal.windows.exponential,
+    "Tukey": signal.windows.tukey,
+    "Taylor": signal.windows.taylor,
+    "Lanczos": signal.windows.lanczos,
+}
+
+# numpy sample type, sample length in bytes and peak sample value for each
+# pyaudio sample format. Anything else is treated as 16-bit signed int
+# FIXME: pyaudio.paInt24 has no numpy equivalent
+_FORMAT_TO_NP = {
+    pyaudio.paInt16: np.int16,
+    pyaudio.paInt32: np.int32,
+    pyaudio.paFloat32: np.float32,
+    pyaudio.paInt8: np.int8,
+}
+_FORMAT_TO_LEN = {
+    pyaudio.paInt16: 2,
+    pyaudio.paInt32: 4,
+    pyaudio.paFloat32: 4,
+    pyaudio.paInt8: 1,
+}
+_FORMAT_TO_PEAK = {
+    pyaudio.paInt16: 2 ** 15 - 1,
+    pyaudio.paInt32: 2 ** 31 - 1,
+    pyaudio.paFloat32: (2.0 ** 23.0 - 1.0) + (2.0 ** -23.0 - 1.0),
+    pyaudio.paInt8: 2 ** 7 - 1,
+}
+
+# scipy filter names by the name used in the Settings dialog UI
+_FILT_NAMES = {
+    "Low pass": "lowpass",
+    "High pass": "hp",
+    "Band pass": "bandpass",
+    "Band stop": "bandstop",
+}
+
+
+@lru_cache(maxsize=8)
+def _window_function(windowName, sampleCount):
+    '''
+    Return the window function of a given name from _WINDOW_FNS for a given
+    number of samples, or None if the name isn't known. The window is single
+    precision to match the samples it's applied to. Windows are cached by name
+    and size so that changing settings back and forth doesn't recompute them,
+    they're shared so they are made read-only.
+    '''
+
+    windowFn = _WINDOW_FNS.get(windowName)
+    if windowFn is None:
+        return None
+
+    fnWindow = np.ascontiguousarray(windowFn(sampleCount), dtype=np.float32)
+    fnWindow.flags.writeable = False
+
+    return fnWindow
+
+
+@lru_cache(maxsize=32)
+def _design_filter(filtType, filtOrder, filtLowF, filtHighF, sampleRate):
+    '''
+    Return the Butterworth second-order sections for a filter type named as in
+    the Settings dialog UI, or None if the frequencies don't suit the type at
+    the sample rate. Designs are cached by their parameters so that changing
+    settings back and forth doesn't redesign them. They're shared, callers
+    must not modify them (sosfilt() only reads them but won't accept a
+    read-only array).
+    FIXME: Improve this to allow filter model selection and other filter
+           attributes. Requires UI changes as well.
+    '''
+
+    filtName = _FILT_NAMES.get(filtType)
+    if filtName is None:
+        return None
+
+    nyquistF = int(sampleRate / 2)
+
+    # Check the frequencies the filter type uses are in range
+    if filtType == "Low pass":
+        if (filtHighF <= 0) or (filtHighF >= nyquistF):
+            return None
+        fCutoff = filtHighF
+    elif filtType == "High pass":
+        if (filtLowF <= 0) or (filtLowF >= nyquistF):
+            return None
+        fCutoff = filtLowF
+    else:
+        # butter() needs both band edges strictly between zero and nyquist
+        if (filtLowF <= 0) or (filtHighF >= nyquistF) or\
+                (filtHighF <= filtLowF):
+            return None
+        fCutoff = [filtLowF, filtHighF]
+
+    sos = signal.butter(filtOrder, fCutoff, btype=filtName, fs=sampleRate,
+                        output='sos')
+
+    return sos
+
+
+def _rfft_power(samples, transformLen, power):
+    '''
+    Return the power spectrum, |X|^2, of real samples zero padded to
+    transformLen. The samples can be one frame or a 2-D array with a frame in
+    each row, the frames are transformed together and each row of the result
+    is the power spectrum of that frame. It's written to power, which must
+    have transformLen / 2 + 1 elements in each row, so that a power spectrum
+    isn't allocated for every transform.
+    The samples array is used as a work area and may be overwritten. It's
+    kept at module level, away from the thread state, so that it only works on
+    what it's passed. scipy releases the GIL for the transform so it doesn't
+    hold up the UI thread while the audio thread uses it.
+    '''
+
+    spectrum = rfft(samples, n=transformLen, axis=-1, norm="backward",
+                    workers=-1, overwrite_x=True)
+
+    # View the complex bins as (real, imaginary) pairs and sum the squares of
+    # each pair in one pass. It avoids the square root np.abs() would do and
+    # the temporary arrays of squaring the real and imaginary parts separately
+    pairs = spectrum.view(spectrum.real.dtype).reshape(spectrum.shape + (2,))
+
+    return np.einsum('...j,...j->...', pairs, pairs, out=power)
+
+
 class qtmAudioRxThread(QThread):
     '''
     Audio capture thread class. Performs monitoring of audio sample data and
@@ -67,12 +214,28 @@ class qtmAudioRxThread(QThread):
            gathering the FFT data AND and number of combined elements in it.
     '''
 
-    audioThreadLock = QMutex()
+    # The object lock (audioThreadLock) is made for each instance when it's
+    # constructed, a class one would be shared by every instance
+    audioThreadLock = None
     showLocks = False
 
     audioDev = None
     stream = None
 
+    # The stream is opened in callback mode, pyaudio calls __audio_callback()
+    # from its own thread with each frame of sample data and it's queued here
+    # for the thread loop. It's how long the loop waits for a frame before
+    # checking if it's been asked to stop. The queue is limited to
+    # capturedFramesMax frames (a few seconds of audio), if the thread loop
+    # falls that far behind new frames are dropped rather than the queue
+    # growing without limit. An input overflow reported by pyaudio and
+    # dropped frames are each only reported once for each opened stream
+    capturedFrames = None
+    capturedFramesMax = 256
+    captureTimeout = 0.25
+    overflowReported = False
+    dropReported = False
+
     endRun = False
 
     showBadFilterMessage = Signal(str)
@@ -90,11 +253,34 @@ class qtmAudioRxThread(QThread):
     RATE = 44100
     nyquistRate = int(44100 / 2)
     SAMPLE_FRAME_LEN = 1024
-    lastRate = 0
 
-    # Mean amplitude for each sample frame and sum of them
-    sampleFrameAmplitudes = []
-    nSampleFrameAmplitudes = 0
+    # Peak possible sample value for the format and its reciprocal, so that
+    # sample values can be made relative to it by multiplying
+    PEAK = 2 ** 15 - 1
+    peakReciprocal = 1.0 / PEAK
+
+    # For integer sample formats of up to 16-bits, dB values for every
+    # (rounded) mean amplitude from 0 to PEAK, made when the format is set
+    dBTable = None
+
+    # 20 / ln(10), for 20 * log10(x) as log20 * ln(x). The last amplitude sum
+    # and count a dB value was computed from and the value, current_dB() is
+    # asked for more often than the amplitudes change
+    log20 = 20.0 / math.log(10.0)
+    lastDBSum = 0
+    lastDBCount = -1
+    lastDB = -90
+
+    # Samples in a frame and the duration of a frame in seconds. They only
+    # change when the frame length, channels, sample format or rate change so
+    # they are computed then rather than every time they are used
+    samplesPerFrame = SAMPLE_FRAME_LEN / (1.0 * CHANNELS * sampleLen)
+    sampleFrameDuration = samplesPerFrame / RATE
+
+    # Mean amplitude for each sample frame and sum of them. The amplitudes are
+    # kept in a deque limited to the rolling mean length so that appending a
+    # new amplitude evicts the oldest one when it is full
+    sampleFrameAmplitudes = None
     sumSampleFrameAmplitudes = 0
     meanSampleFrames = 1
 
@@ -115,10 +301,18 @@ class qtmAudioRxThread(QThread):
     batchFFTDuration = int(2.0 * tFFTUnit)
 
     # The accumulating sample data over time, it doesn't need to be endless but
-    # it does need to have enough for a few tFFTUnit counts
+    # it does need to have enough for a few tFFTUnit counts. The array is
+    # allocated once with room for a batch of FFTs and new samples are copied
+    # in after the nSampleStream samples already in use. It only grows if the
+    # FFTs fall behind. Samples are kept in single precision like the captured
+    # samples and the window function
     sampleStream = None
     nSampleStream = 0
 
+    # Samples in the stream before this position have been through any filter
+    # configured for the spectrum view
+    nFilteredStream = 0
+
     # Length of the sample stream in units of length tFFTUnit
     fftFrameCount = 0
 
@@ -129,13 +323,22 @@ class qtmAudioRxThread(QThread):
     # fftAciveFrame = 0
     fftActiveStart = 0
 
-    # Summed FFT data and number of summed elements
+    # Summed FFT power data and number of summed elements. The sum is allocated
+    # when the transform length is set and zeroed when it's taken, the square
+    # root is only taken then too, once for all the FFTs in the sum
     fftSum = None
     accumFFTSums = 0
 
-    # x-axis frequencies for bins
+    # Set when fft_data() is called so that the audio thread transforms any
+    # complete frames with the next captured sample frame instead of waiting
+    # for a full batch. The FFTs are only done by the audio thread
+    fftRequested = False
+
+    # x-axis frequencies for bins. They only change with the transform length
+    # or sample rate, they're discarded when the window function is created
+    # and computed again the next time they're asked for. The array is
+    # read-only so it can be handed out without copying
     xFreq = None
-    lastBinCount = 0
 
     # Window overlap
     windowOverlapRatio = 0.66
@@ -147,15 +350,28 @@ class qtmAudioRxThread(QThread):
     # The actual window function
     fnWindow = None
 
-    # A work-in-progress sample frame that is to be used by multiple functions
-    # It must be populated, modified by the multiple functions and used within
-    # a single object lock period
-    frameSamples = None
-    nFrameSamples = 0
-
-    # The same as frameSamples but after applying a filter, the same rules
-    # apply as for frameSamples.
-    filteredSameples = None
+    # The length of the transform, the FFT frame size rounded up to a length
+    # the FFT is fast for, and a buffer with a row of that length for each of
+    # up to fftBatchFrames frames that are windowed and transformed together.
+    # Any part of a row after the frame is zero padding. The power spectrum of
+    # each transform is written to a row of fftPower, the rows are summed into
+    # fftBatchPower before it's added to the sum.
+    fftTransformLen = 0
+    fftBatchFrames = 8
+    windowedSamples = None
+    fftPower = None
+    fftBatchPower = None
+
+    # Captured audio samples converted to 32-bit floating point. Allocated when
+    # audio is started and re-used for every capture so that all of the math
+    # on the samples is done in single precision. It has room for the most
+    # frames the thread loop takes from the capture queue at once
+    captureSamples = None
+    captureBatchFrames = 16
+
+    # Work area for the absolute values of captured frames, allocated and
+    # re-used in the same way as captureSamples
+    absSamples = None
 
     # Configuration for any enabled audio filter applied when making the
     # spectrum view. Among the uses of this is to filter out signal material at
@@ -166,12 +382,35 @@ class qtmAudioRxThread(QThread):
     filtHighF = 2
     filtOrder = 3
 
-    # These are the actual filter
-    filterA = None
-    filterB = None
+    # These are the actual filter, as second-order sections, and the filter
+    # state carried from one batch of new stream samples to the next so that
+    # the captured audio is filtered as one continuous signal
+    filterSOS = None
+    filterZI = None
+    filterReported = False
 
     logCategory = QLoggingCategory("QtMeter.Audio.Thread")
 
+    def __init__(self):
+        '''
+        Constructs the audio thread. Audio is not started until the thread is
+        started.
+        '''
+
+        super(qtmAudioRxThread, self).__init__()
+
+        # State that must not be shared with other instances
+        self.audioThreadLock = QMutex()
+        self.__reset_stream_amplitude()
+
+        # Without lock diagnosis __lock() and __unlock() would only test
+        # showLocks and call the QMutex, which they do for every captured
+        # frame. Replace them for this instance with the QMutex functions
+        # themselves. Set showLocks before constructing to diagnose locks
+        if self.showLocks is not True:
+            self.__lock = self.audioThreadLock.lock
+            self.__unlock = self.audioThreadLock.unlock
+
     def __show_lock(self, isLock=True):
         '''
         Show the line number identifying a lock/unlock request. Caller of this
@@ -246,21 +485,56 @@ class qtmAudioRxThread(QThread):
             if self.FORMAT == pyaudio.paInt8:
                 qCDebug(self.logCategory, "Starting 8-bit signed audio stream")
                 # debug_message("Starting 8-bit signed audio stream")
+            self.capturedFrames = queue.Queue(maxsize=self.capturedFramesMax)
+            self.overflowReported = False
+            self.dropReported = False
             self.stream = self.audioDev.open(format=self.FORMAT,
                                              channels=self.CHANNELS,
                                              rate=self.RATE,
                                              input=True,
-                                             frames_per_buffer=self.SAMPLE_FRAME_LEN)
+                                             frames_per_buffer=self.SAMPLE_FRAME_LEN,
+                                             stream_callback=self.__audio_callback)
             if self.stream is not None:
                 qCDebug(self.logCategory, "Started audio, stream open")
                 # debug_message("Started audio, stream open")
 
+            # Somewhere to convert captured samples to floating point
+            nSamples = self.SAMPLE_FRAME_LEN * self.CHANNELS
+            nSamples *= self.captureBatchFrames
+            self.captureSamples = np.empty(nSamples, dtype=np.float32)
+            self.absSamples = np.empty_like(self.captureSamples)
+
             # Reset sample tracking data
             self.__reset_stream_amplitude()
 
             # FIXME: Add back FFT support
             self.__preset_fft_state()
 
+    def __audio_callback(self, in_data, frame_count, time_info, status):
+        '''
+        pyaudio stream callback, called from the audio library's thread with a
+        frame of sample data. It only queues the data for the thread loop so
+        that the audio library isn't held up. If the queue is full the frame is
+        dropped.
+        '''
+
+        # A non-zero status is pyaudio's input overflow/underflow flags, the
+        # audio library may have lost samples before we were given them
+        if (status != 0) and (not self.overflowReported):
+            self.overflowReported = True
+            msg = "Audio input status 0x{:x}, samples may be lost".format(status)
+            qCWarning(self.logCategory, msg)
+
+        try:
+            self.capturedFrames.put_nowait(in_data)
+        except queue.Full:
+            if not self.dropReported:
+                self.dropReported = True
+                msg = "Audio capture queue full, dropping frames"
+                qCWarning(self.logCategory, msg)
+
+        return (None, pyaudio.paContinue)
+
     def __stop_audio(self):
         '''
         If there is an open sample stream close it. If there is an open audio
@@ -312,6 +586,7 @@ class qtmAudioRxThread(QThread):
                 # Don't compute the Nyquist frequency every time we need it,
                 # compute it only if we change the sample rate
                 self.nyquistRate = int(newRate / 2)
+                self.__set_frame_sizes()
                 self.set_sample_window(self.sampleWindow)
 
             # Create a window function based on this rate even if we didn't
@@ -336,6 +611,7 @@ class qtmAudioRxThread(QThread):
         self.__set_numpy_sample_format()
         self.__set_sample_len()
         self.__sample_peak()
+        self.__set_frame_sizes()
 
     @property
     def mono_source(self):
@@ -351,6 +627,7 @@ class qtmAudioRxThread(QThread):
         '''
 
         self.CHANNELS = 1
+        self.__set_frame_sizes()
 
     @property
     def stereo_source(self):
@@ -366,6 +643,7 @@ class qtmAudioRxThread(QThread):
         '''
 
         self.CHANNELS = 2
+        self.__set_frame_sizes()
 
     @property
     def channels(self):
@@ -381,6 +659,20 @@ class qtmAudioRxThread(QThread):
         '''
 
         self.SAMPLE_FRAME_LEN = int(newSize)
+        self.__set_frame_sizes()
+
+    def __set_frame_sizes(self):
+        '''
+        Compute the number of samples in a frame and the frame duration when
+        anything they depend on changes
+        '''
+
+        # A sample is channel times sample length values
+        self.samplesPerFrame = self.SAMPLE_FRAME_LEN /\
+                (1.0 * self.CHANNELS * self.sampleLen)
+
+        # How long does the chunk size we record contain samples for
+        self.sampleFrameDuration = self.samplesPerFrame / self.RATE
 
     def __set_numpy_sample_format(self):
         '''
@@ -388,40 +680,16 @@ class qtmAudioRxThread(QThread):
         the pyaudio sample size code
         '''
 
-        # These are oddly ordered but in likelihood of use to minimize execution
-        # cost for the most used cases
-        if self.FORMAT == pyaudio.paInt16:
-            self.sampleFormat = np.int16
-        # elif self.FORMAT == pyaudio.paInt24:
-        #     sampleFormat = np.int24
-        elif self.FORMAT == pyaudio.paInt32:
-            self.sampleFormat = np.int32
-        elif self.FORMAT == pyaudio.paFloat32:
-            self.sampleFormat = np.float32
-        elif self.FORMAT == pyaudio.paInt8:
-            self.sampleFormat = np.int8
-        else:
-            # Assume 16-bit signed int by default
-            self.sampleFormat = np.int16
+        # Assume 16-bit signed int by default
+        self.sampleFormat = _FORMAT_TO_NP.get(self.FORMAT, np.int16)
 
     def __set_sample_len(self):
         '''
         Return the length of an audio sample in bytes
         '''
 
-        if self.FORMAT == pyaudio.paInt16:
-            self.sampleLen = 2
-        elif self.FORMAT == pyaudio.paInt32:
-            self.sampleLen = 4
-        elif self.FORMAT == pyaudio.paFloat32:
-            self.sampleLen = 4
-        elif self.FORMAT == pyaudio.paInt8:
-            self.sampleLen = 1
-        # elif self.FORMAT == pyaudio.paInt24:
-        #     sampleFormat = numpy.int24
-        else:
-            # Assume 16-bit signed int by default
-            self.sampleLen = 2
+        # Assume 16-bit signed int by default
+        self.sampleLen = _FORMAT_TO_LEN.get(self.FORMAT, 2)
 
     def __sample_peak(self):
         '''
@@ -430,26 +698,31 @@ class qtmAudioRxThread(QThread):
         the value obtained from this function.
         '''
 
-        if self.FORMAT == pyaudio.paInt16:
-            self.PEAK = 2 ** 15 - 1
-        elif self.FORMAT == pyaudio.paInt32:
-            self.PEAK = 2 ** 31 - 1
-        elif self.FORMAT == pyaudio.paFloat32:
-            max_exponent = 2.0 ** 23.0 - 1.0
-            max_fraction = 2.0 ** -23.0 - 1.0
-            self.PEAK = max_exponent + max_fraction
-        elif self.FORMAT == pyaudio.paInt8:
-            self.PEAK = 2 ** 7 - 1
+        # Assume 16-bit signed int by default
+        self.PEAK = _FORMAT_TO_PEAK.get(self.FORMAT, 2 ** 15 - 1)
+        self.peakReciprocal = 1.0 / self.PEAK
+
+        # Integer formats up to 16-bits have few enough possible mean
+        # amplitudes to look their dB values up rather than compute them. Zero
+        # is the minimum value the meter can display
+        if self.FORMAT in (pyaudio.paInt16, pyaudio.paInt8):
+            dBTable = np.arange(self.PEAK + 1, dtype=np.float64)
+            dBTable[0] = 1.0
+            dBTable = 20.0 * np.log10(dBTable * self.peakReciprocal)
+            dBTable[0] = -90
+            self.dBTable = dBTable.tolist()
         else:
-            # Assume 16-bit signed int by default
-            self.PEAK = 2 ** 15 - 1
+            self.dBTable = None
+
+        # Any dB value we have is for the old peak
+        self.lastDBCount = -1
 
         # Float format returns a float, int format returns an int
         return self.PEAK
 
     @property
     def sample_peak(self):
-        return self.__sample_peak()
+        return self.PEAK
 
     @property
     def samples_per_frame(self):
@@ -458,8 +731,7 @@ class qtmAudioRxThread(QThread):
         bytes, return the number of samples per chunk.
         '''
 
-        # A sample is channel times sample length values
-        return self.SAMPLE_FRAME_LEN / (1.0 * self.CHANNELS * self.sampleLen)
+        return self.samplesPerFrame
 
     @property
     def sample_frame_duration(self):
@@ -468,8 +740,7 @@ class qtmAudioRxThread(QThread):
         of a sample frame in seconds.
         '''
 
-        # How long does the chunk size we record contain samples for
-        return self.samples_per_frame / self.RATE
+        return self.sampleFrameDuration
 
     def mean_sample_frames_in_duration(self, duration):
         '''
@@ -519,6 +790,12 @@ class qtmAudioRxThread(QThread):
             if self.meanSampleFrames > secondOfSampleFrames:
                 self.meanSampleFrames = secondOfSampleFrames
 
+        # The amplitude buffer only changes size when the number of frames in
+        # the rolling mean changes
+        if (self.sampleFrameAmplitudes is not None) and\
+                (self.sampleFrameAmplitudes.maxlen != self.meanSampleFrames):
+            self.__resize_stream_amplitude()
+
         # If there are no FFT chunks use the same as mean chunks
         # FIXME: FFT excluded for now
         if False is True:
@@ -537,9 +814,10 @@ class qtmAudioRxThread(QThread):
         '''
 
         # If there is any sample data
-        if self.nSampleFrameAmplitudes > 0:
+        nAmp = len(self.sampleFrameAmplitudes)
+        if nAmp > 0:
             # The mean is sum divided by the count
-            mAmp = self.sumSampleFrameAmplitudes / (1.0 * self.nSampleFrameAmplitudes)
+            mAmp = self.sumSampleFrameAmplitudes / (1.0 * nAmp)
         else:
             # No data, assume mean of 1.0
             mAmp = 1.0
@@ -555,9 +833,9 @@ class qtmAudioRxThread(QThread):
         '''
 
         # If there is any sample data
-        if self.nSampleFrameAmplitudes > 0:
+        if len(self.sampleFrameAmplitudes) > 0:
             # Get the maximum amplitude of signal amplitudes
-            mAmp = np.max(self.sampleFrameAmplitudes)
+            mAmp = max(self.sampleFrameAmplitudes)
         else:
             # No data, use the highest possible value
             # FIXME: Doesn't zero make more sense when there is no data?
@@ -576,18 +854,35 @@ class qtmAudioRxThread(QThread):
         environment.
         '''
 
-        # Lock the set of sample data we test
+        # Lock the set of sample data we test, only long enough to read the
+        # amplitude sum and count
         self.__lock()
 
-        meanAmp = self.__current_mean_amplitude
-        # maxAmp = self.__current_max_amplitude
+        sumAmp = self.sumSampleFrameAmplitudes
+        nAmp = len(self.sampleFrameAmplitudes)
 
         # No longer need unchanging sample data
         self.__unlock()
 
+        # The meter can ask more often than frames are captured, if nothing
+        # changed since the last time the dB value is the same
+        if (sumAmp == self.lastDBSum) and (nAmp == self.lastDBCount):
+            return self.lastDB
+
+        if nAmp > 0:
+            # The mean is sum divided by the count
+            meanAmp = sumAmp / (1.0 * nAmp)
+        else:
+            # No data, assume mean of 1.0
+            meanAmp = 1.0
+
         peakAmp = self.PEAK
+        dBTable = self.dBTable
         # debug_message("dB from: {:.1f} / {}".format(mAmp, self.PEAK))
-        if (meanAmp == 0.0) or (peakAmp == 0.0):
+        if dBTable is not None:
+            # Look it up for the nearest integer mean amplitude
+            dBVal = dBTable[min(int(meanAmp + 0.5), peakAmp)]
+        elif (meanAmp == 0.0) or (peakAmp == 0.0):
             # Zero would cause a ValueError from computing the signal level
             # ratio or from log10. Use the minimum value the meter can display.
             dBVal = -90
@@ -596,8 +891,13 @@ class qtmAudioRxThread(QThread):
             #     qCDebug(self.logCategory, "dB mean: {}, peak {}".format(meanAmp, peakAmp))
 
             # Compute the dB value from the ratio of signal mean and max
-            # possible so that all dB values are relative to the same value
-            dBVal = 20.0 * math.log10(meanAmp / peakAmp)
+            # possible so that all dB values are relative to the same value.
+            # 20 * log10(x) is done as a natural log times a constant
+            dBVal = self.log20 * math.log(meanAmp * self.peakReciprocal)
+
+        self.lastDBSum = sumAmp
+        self.lastDBCount = nAmp
+        self.lastDB = dBVal
 
         # Return the dB value (all are ratios of mean versus peak possible value
         # so that quiet signals aren't amplified relative to loud signals
@@ -647,19 +947,27 @@ class qtmAudioRxThread(QThread):
     @property
     def fft_data(self):
         '''
-        Return the current FFT frequency power bins data
-        FIXME: We can't prevent this having data added after we obtain it and
-               before we reset it...
+        Return the current FFT frequency bins data. The summed power of the
+        FFTs since the last call is returned as its square root so that the
+        values are in amplitude units as they always were. It's a new array the
+        caller can modify.
         '''
 
         # fftFrameSize = self.__fft_frame_size
 
+        # Take the sum and reset it in the same lock period so that no FFT can
+        # be added between the two. The FFTs are done by the audio thread, we
+        # don't do them here because it would be in the caller's (UI) thread.
+        # Any frames not transformed yet are in the next sum, ask for them to
+        # be done now rather than at the end of the batch
         self.__lock()
 
-        # Update FFT, if necessary
-        self.__do_FFT()
+        self.fftRequested = True
 
-        result = self.fftSum
+        if self.accumFFTSums > 0:
+            result = np.sqrt(self.fftSum)
+        else:
+            result = None
 
         # qCDebug(self.logCategory, "Returning {} accumulated FFTs".format(self.accumFFTSums))
 
@@ -674,7 +982,8 @@ class qtmAudioRxThread(QThread):
         # fftAciveFrame = 0
 
         # Summed FFT data and number of summed elements are reset
-        self.fftSum = None
+        if self.fftSum is not None:
+            self.fftSum.fill(0.0)
         self.accumFFTSums = 0
 
         self.__unlock()
@@ -689,11 +998,27 @@ class qtmAudioRxThread(QThread):
         '''
 
         self.__lock()
+        if (self.xFreq is None) and (self.fftTransformLen > 0):
+            self.__create_bin_frequencies()
         result = self.xFreq
         self.__unlock()
 
         return result
 
+    def __create_bin_frequencies(self):
+        '''
+        Compute the frequency of each bin for the current transform length and
+        sample rate. Caller MUST hold the object lock.
+        '''
+
+        # The bins are RATE / length apart from 0Hz up to the Nyquist
+        # frequency
+        nBins = int(self.fftTransformLen / 2) + 1
+        xFreq = np.arange(nBins, dtype=np.float32) *\
+                np.float32(self.RATE / self.fftTransformLen)
+        xFreq.flags.writeable = False
+        self.xFreq = xFreq
+
     def reset_FFT_data(self):
         '''
         Caller owns the time-domain and we sum FFT data between calls to this
@@ -717,29 +1042,64 @@ class qtmAudioRxThread(QThread):
 
         self.__unlock()
 
-    def __capture_audio_sample_frame(self):
+    def __capture_audio_sample_frames(self):
         '''
-        Capture a frame of audio samples. Caller is responsible for knowing that
-        self.__audio_open is True (an audio stream is open)
+        Capture the frames of audio samples queued by the stream callback,
+        waiting for at least one. Caller is responsible for knowing that
+        self.__audio_open is True (an audio stream is open). Any frames that
+        have queued up since the last call are taken together, up to
+        captureBatchFrames, so that they are handled in one pass. The samples
+        are returned as 32-bit floating point in the captureSamples buffer,
+        they must be used or copied before the next capture, along with a list
+        of the number of samples in each frame. Waits up to captureTimeout
+        seconds for a frame, raises IOError if none arrives.
         '''
 
-        # Capture a frame of audio samples
+        # Capture the queued frames of audio samples
+        frames = []
         try:
-            data = self.stream.read(self.SAMPLE_FRAME_LEN)
-            if data is not None:
-                # Get a view of the data we can use numpy to perform
-                # calculations on.
-                sampleFrame = np.frombuffer(data, dtype=self.sampleFormat)
-
-                # Return the frame
-                return sampleFrame
-
-        except IOError as e:
-            msg = "Audio device read error: {}".format(e)
+            frames.append(self.capturedFrames.get(timeout=self.captureTimeout))
+            while len(frames) < self.captureBatchFrames:
+                frames.append(self.capturedFrames.get_nowait())
+        except queue.Empty:
+            # Nothing more queued
+            pass
+
+        if len(frames) < 1:
+            msg = "No audio received in {}s".format(self.captureTimeout)
             qCWarning(self.logCategory, msg)
 
-        # If we get here we didn't get a sample frame
-        raise IOError
+            # We didn't get a sample frame
+            raise IOError
+
+        # Convert them to floating point once, one after another in the buffer
+        # we keep for it, rather than have each use of them promote them to a
+        # new double precision array
+        nFrameSamples = []
+        nSamples = 0
+        for data in frames:
+            # Get a view of the data we can use numpy to perform
+            # calculations on. We know how many samples there are, only
+            # a short final frame needs them counting
+            nNew = self.SAMPLE_FRAME_LEN * self.CHANNELS
+            if len(data) < (nNew * self.sampleLen):
+                nNew = len(data) // self.sampleLen
+            sampleFrame = np.frombuffer(data, dtype=self.sampleFormat,
+                                        count=nNew)
+
+            nEnd = nSamples + nNew
+            if nEnd > self.captureSamples.size:
+                newSamples = np.empty(nEnd, dtype=np.float32)
+                newSamples[:nSamples] = self.captureSamples[:nSamples]
+                self.captureSamples = newSamples
+            np.copyto(self.captureSamples[nSamples:nEnd], sampleFrame,
+                      casting='unsafe')
+
+            nFrameSamples.append(nNew)
+            nSamples = nEnd
+
+        # Return the frames
+        return self.captureSamples[:nSamples], nFrameSamples
 
     def set_window_type(self, newType):
         self.windowFn = newType
@@ -762,65 +1122,13 @@ class qtmAudioRxThread(QThread):
         Returns the window function
         '''
 
-        if windowName == "Boxcar":
-            fnWindow = signal.windows.boxcar(sampleCount)
-        elif windowName == "Triangular":
-            fnWindow = signal.windows.triang(sampleCount)
-        elif windowName == "Blackman":
-            fnWindow = signal.windows.blackman(sampleCount)
-        elif windowName == "Hamming":
-            fnWindow = signal.windows.hamming(sampleCount)
-        elif windowName == "Hann":
-            fnWindow = signal.windows.hann(sampleCount)
-        elif windowName == "Bartlett":
-            fnWindow = signal.windows.bartlett(sampleCount)
-        elif windowName == "Flat top":
-            fnWindow = signal.windows.flattop(sampleCount)
-        elif windowName == "Parzen":
-            fnWindow = signal.windows.parzen(sampleCount)
-        elif windowName == "Bohman":
-            fnWindow = signal.windows.bohman(sampleCount)
-        elif windowName == "Blackman-Harris":
-            fnWindow = signal.windows.blackmanharris(sampleCount)
-        elif windowName == "Nuttall":
-            fnWindow = signal.windows.nuttall(sampleCount)
-        elif windowName == "Bartlett-Hann":
-            fnWindow = signal.windows.barthann(sampleCount)
-        elif windowName == "Cosine":
-            fnWindow = signal.windows.cosine(sampleCount)
-        elif windowName == "Exponential":
-            fnWindow = signal.windows.exponential(sampleCount)
-        elif windowName == "Tukey":
-            fnWindow = signal.windows.tukey(sampleCount)
-        elif windowName == "Taylor":
-            fnWindow = signal.windows.taylor(sampleCount)
-        elif windowName == "Lanczos":
-            fnWindow = signal.windows.lanczos(sampleCount)
-        else:
+        fnWindow = _window_function(windowName, sampleCount)
+        if fnWindow is None:
             # Unrecognized, assume no window
             qCDebug(self.logCategory, "Unrecognized window {}, size {}".format(windowName, sampleCount))
-            fnWindow = None
 
         return fnWindow
 
-    def __get_sp_filter_name(self):
-        '''
-        Get the scipy filter name from our own, human readable  name
-        '''
-
-        if self.filtType == "Low pass":
-            filtName = "lowpass"
-        elif self.filtType == "High pass":
-            filtName = "hp"
-        elif self.filtType == "Band pass":
-            filtName = "bandpass"
-        elif self.filtType == "Band stop":
-            filtName = "bandstop"
-        else:
-            filtName = ""
-
-        return filtName
-
     @property
     def filter_type(self):
         return self.filtType
@@ -859,64 +1167,33 @@ class qtmAudioRxThread(QThread):
 
     def __create_sample_filter(self):
         '''
-        If we have a configured sample filter return it, this doesn't do the
-        sample filtering. If a and b are both not None the caller is expected
-        to use scipy.signal.filtfilt(), if a is not None and b is None the
-        caller is expected to use scipy.signal.sosfilt(). If a and b are both
-        None the signal should not be filtered. a is None and b is not None is
-        undefined for the caller.
+        If we have a configured sample filter make it class state, this doesn't
+        do the sample filtering. The filter is always second-order sections for
+        use with scipy.signal.sosfilt() along with a zero filter state. If
+        filterSOS is None the signal should not be filtered.
         '''
 
-        # Do we need a filter
-        a = None
-        b = None
-
         self.__lock()
 
+        # Second-order sections are stable at higher orders where the b, a
+        # form is not and can be applied a captured frame at a time by carrying
+        # the filter state
         if self.filtType != "":
             # qCDebug(self.logCategory, "Use filter: {}".format(self.filtType))
+            sos = _design_filter(self.filtType, self.filtOrder,
+                                 self.filtLowF, self.filtHighF,
+                                 self.sample_rate)
+        else:
+            sos = None
 
-            # Get the scipy filter name to use
-            filtName = self.__get_sp_filter_name()
-
-            # Use the name to choose what to do. This requires a lot of care,
-            # if a and b are not None the caller should do a signal.filtfilt()
-            # but order of a and b matters. If a is not None and b is None the
-            # caller should use a for signal.sosfilt().
-            # FIXME: Improve this to allow filter model selection and other,
-            #        filter attributes (e.g. order). Requires UI changes as
-            #        well.
-            if self.filtType == "Low pass":
-                if (self.filtHighF > 0) and\
-                        (self.filtHighF < self.nyquist_frequency):
-                    a, b = signal.butter(self.filtOrder, self.filtHighF,
-                                         btype=filtName)
-            elif self.filtType == "High pass":
-                if (self.filtLowF > 0) and\
-                        (self.filtLowF < self.nyquist_frequency):
-                    a = signal.butter(self.filtOrder, self.filtLowF,
-                                      btype=filtName, fs=self.sample_rate,
-                                      output='sos')
-                    b = None
-            elif self.filtType == "Band pass":
-                if (self.filtLowF > 0) and\
-                        (self.filtHighF <= self.nyquist_frequency) and\
-                        (self.filtHighF > self.filtLowF):
-                    fRange = [self.filtLowF, self.filtHighF]
-                    a, b = signal.butter(self.filtOrder, fRange,
-                                         btype=filtName,
-                                         fs=self.sample_rate)
-            elif self.filtType == "Band stop":
-                if (self.filtLowF >= 0) and\
-                        (self.filtHighF <= self.nyquist_frequency) and\
-                        (self.filtHighF > self.filtLowF):
-                    fRange = [self.filtLowF, self.filtHighF]
-                    a, b = signal.butter(self.filtOrder, fRange,
-                                         btype=filtName,
-                                         fs=self.sample_rate)
-
-        self.filterA = a
-        self.filterB = b
+        # Start the filter from a zero state, the first samples filtered are
+        # treated as following silence
+        self.filterSOS = sos
+        if sos is not None:
+            self.filterZI = np.zeros((sos.shape[0], 2))
+        else:
+            self.filterZI = None
+        self.filterReported = False
 
         self.__unlock()
 
@@ -924,7 +1201,11 @@ class qtmAudioRxThread(QThread):
         '''
         Given the current position and minimum sample length for overlapped
         windowing, drop any used samples. Caller MUST hold object lock since we
-        discarding sample data and adjusting positional state
+        discarding sample data and adjusting positional state. Dropping samples
+        moves the ones we keep to the start of the stream, it's left until the
+        stream is more than half full so that it's done rarely rather than
+        after every batch of FFTs. New samples are added after the ones there
+        without any copy until then.
         '''
 
         # How big is a FFT frame and the minimum number of frames in samples
@@ -941,11 +1222,23 @@ class qtmAudioRxThread(QThread):
             # qCDebug(self.logCategory, msg)
 
             # We slice from the slice position to the end, but limit it to at
-            # least one frame
-            if sliceSamples >= fftFrameSize:
-                tmpSlicedStream = self.sampleStream[sliceSamples:]
-                self.sampleStream = tmpSlicedStream.copy()
-                self.nSampleStream -= sliceSamples
+            # least one frame and only when we need the room
+            if (sliceSamples >= fftFrameSize) and\
+                    (self.nSampleStream > (self.sampleStream.size / 2)):
+                # Move the samples we keep to the start of the existing array
+                # rather than allocating a new one. It's done in blocks no
+                # longer than the distance they move so that no block overlaps
+                # where it's copied to, numpy would copy an overlapping source
+                # to a temporary array first
+                nKeep = self.nSampleStream - sliceSamples
+                for iStart in range(0, nKeep, sliceSamples):
+                    iEnd = min(iStart + sliceSamples, nKeep)
+                    self.sampleStream[iStart:iEnd] =\
+                            self.sampleStream[sliceSamples + iStart:
+                                              sliceSamples + iEnd]
+                self.nSampleStream = nKeep
+                self.nFilteredStream =\
+                        max(0, self.nFilteredStream - sliceSamples)
 
                 # We must update object counting and postioning data
                 # newLength = self.sampleStream.size
@@ -1024,11 +1317,12 @@ class qtmAudioRxThread(QThread):
         return fftFrameStart, fftFrameEnd, fftFrameLen
 
     def __get_next_frame_limits(self, fftFrameStart, fftFrameLen,\
-                                overlapLength):
+                                overlapLength, nFrames=1):
         '''
         Return a subsequent pass start, end and length of the next frame for
-        __do_FFT(). Caller should hold object lock to prevent critical values
-        changing while being accessed/used.
+        __do_FFT() after nFrames frames have been transformed. Caller should
+        hold object lock to prevent critical values changing while being
+        accessed/used.
         Parameters
         ----------
             fftFrameStart: Integer
@@ -1039,9 +1333,11 @@ class qtmAudioRxThread(QThread):
                 The length of overlapped samples to use in order to prevent
                 windowing damping signal areas. The value must be smaller than
                 the frame length
+            nFrames: Integer
+                The number of frames transformed from the previous start
         '''
 
-        fftFrameStart += fftFrameLen - overlapLength
+        fftFrameStart += nFrames * (fftFrameLen - overlapLength)
         fftFrameEnd = fftFrameStart + fftFrameLen
 
         self.fftActiveStart = fftFrameStart
@@ -1056,12 +1352,41 @@ class qtmAudioRxThread(QThread):
         # Do it locked because we can do it while the audio is running
         self.__lock()
 
+        # Get the size of a FFT frame
+        fftFrameSize = self.__fft_frame_size
+
+        # The transform length and buffer for the windowed frame only change
+        # when the frame size does
+        fftTransformLen = next_fast_len(fftFrameSize, real=True)
+        if (fftTransformLen != self.fftTransformLen) or\
+                (self.windowedSamples is None):
+            if fftTransformLen != fftFrameSize:
+                msg = "FFT frames of {} samples ".format(fftFrameSize)
+                msg += "are zero padded to {}".format(fftTransformLen)
+                qCDebug(self.logCategory, msg)
+
+            self.fftTransformLen = fftTransformLen
+            self.windowedSamples = np.zeros((self.fftBatchFrames,
+                                             fftTransformLen),
+                                            dtype=np.float32)
+            self.fftPower = np.zeros((self.fftBatchFrames,
+                                      int(fftTransformLen / 2) + 1),
+                                     dtype=np.float32)
+            self.fftBatchPower = np.zeros(int(fftTransformLen / 2) + 1,
+                                          dtype=np.float32)
+
+            # The FFT sum is for one transform length, start a new one
+            self.fftSum = np.zeros(int(fftTransformLen / 2) + 1,
+                                   dtype=np.float32)
+            self.accumFFTSums = 0
+
+        # Bin frequencies may have changed, fft_freqs computes them again
+        self.xFreq = None
+
         # If there is a named window function to be applied
         if self.windowFn != "":
-            # Get the size of a FFT frame
-            fftFrameSize = self.__fft_frame_size
-
-            # Get the current window function
+            # Get the current window function, in single precision to match
+            # the samples it's applied to
             self.fnWindow = self.__get_window_function(self.windowFn,\
                                                        fftFrameSize)
         else:
@@ -1070,46 +1395,34 @@ class qtmAudioRxThread(QThread):
 
         self.__unlock()
 
-    def __apply_any_window_function(self):
+    def __apply_any_window_function(self, streamSamples, fnWindow,
+                                    frameSamples):
         '''
-        Apply the current class window function to the current class samples for
-        FFT transform. Can only be used when the caller holds the object lock
-        and even then only really during the same lock period where the samples
-        were stripped and made class state. Use thread state for the sample data
-        to avoid transferring large arrays in and out of the function. It's
-        really just to reduce the complexity of the view of the _do__FFT()
-        function by putting parts of it with a single purpose in their own
-        functions
+        Apply a window function to frames of samples from the sample stream for
+        FFT transform, writing the result to frameSamples (part of the windowed
+        sample work area). The stream samples and frameSamples have a frame in
+        each row, the window is applied to every row. Copying the frames out of
+        the stream and windowing them is one pass and no temporary array is
+        allocated. With no window the samples are just copied. Caller MUST
+        hold the object lock for the stream, it passes the window function it
+        took from class state in the same lock period. It's really just to
+        reduce the complexity of the view of the _do__FFT() function by putting
+        parts of it with a single purpose in their own functions
         '''
 
-        try:
-            # Apply any window.
-            # FIXME: It would be nice to do this in it's own function but it
-            #        would have o gather the window function afresh for
-            #        every sample frame when it rarely changes between
-            #        frames. We could pass the window fuction we already
-            #        retrieved to make that work but the function can be
-            #        large and we only do the following test and multiply
-            if self.fnWindow is not None:
-                self.frameSamples *= self.fnWindow
-        except:
-            msg = "Exception "
-            # msg += "in window function {} ".format(self.frameSamples.size)
-            msg += "in window function {} ".format(self.nFrameSamples)
-            msg += "versus {}".format(self.fnWindow.size)
-            qCDebug(self.logCategory, msg)
-            raise
+        # Apply any window.
+        if fnWindow is not None:
+            np.multiply(streamSamples, fnWindow, out=frameSamples)
+        else:
+            frameSamples[:] = streamSamples
 
-    def __verify_filtered_data(self):
+    def __verify_filtered_data(self, filteredSamples):
         '''
-        Look at the filtered data, if it has any nan/minnan values the filter
+        Look at the filtered data, if it has any nan/inf values the filter
         probably has a cutoff too close to a band-edge for the sampling.
         '''
 
-        filtMin = np.min(self.filteredSamples)
-        filtMax = np.max(self.filteredSamples)
-
-        if np.isnan(filtMin) or np.isnan(filtMax):
+        if not np.isfinite(filteredSamples).all():
             # Set the message.
             msg = "The filter configured in the Settings dialog cannot be "
             msg += "applied, it results in invalid data that cannot be used "
@@ -1121,170 +1434,187 @@ class qtmAudioRxThread(QThread):
             # Emit the signal to show the QMessageBox in the main thread.
             self.showBadFilterMessage.emit(msg)
 
-    def __apply_any_filter(self):
+    def __apply_any_filter(self, newSamples, filterSOS, filterZI):
         '''
-        Apply the current class filter to the current class samples for FFT
-        transform. Can only be used when the caller holds the class lock and
-        even then only really during the same lock period where the samples
-        were stripped and made class state. If no filter is applied the
-        filteredSamples member is still used to say we've passed this point.
-        It's really just to reduce the complexity of the view of the _do__FFT()
-        function by putting parts of it with a single purpose in their own
-        functions
+        Apply a filter to the samples added to the sample stream since the last
+        time and return the filtered samples and the new filter state. The
+        caller passes the filter and state it took from class state while
+        holding the object lock so that this can be used without holding it.
+        The filter state is carried between calls so this is a single pass of
+        the filter over the captured audio, done in one call for a batch of
+        FFTs, rather than one per FFT frame.
         '''
 
+        filteredSamples = None
         try:
-            # Do we have a filter configuration to apply? Caller must hold
-            # audioThreadLock.
-            if (self.filterA is not None) and (self.filterB is not None):
-                self.filteredSamples = signal.filtfilt(self.filterA,
-                                                       self.filterB,
-                                                       self.frameSamples)
-                self.__verify_filtered_data()
-            elif (self.filterA is not None) and (self.filterB is None):
-                self.filteredSamples = signal.sosfilt(self.filterA,
-                                                      self.frameSamples)
-                self.__verify_filtered_data()
-            else:
-                self.filteredSamples = self.frameSamples
+            filteredSamples, filterZI = signal.sosfilt(filterSOS, newSamples,
+                                                       zi=filterZI)
 
             # Look at filtered samples, if we have any nan values the filter
             # probably has cutoff too close to the edge of the sample band
-            # range
+            # range. The filter state is then nan as well so restart it, only
+            # reporting it once for the filter settings
+            if not np.isfinite(filterZI).all():
+                filterZI = np.zeros_like(filterZI)
+                if not self.filterReported:
+                    self.filterReported = True
+                    self.__verify_filtered_data(filteredSamples)
         except:
             qCDebug(self.logCategory, "Exception in filter")
-            self.__verify_filtered_data()
+            if filteredSamples is not None:
+                self.__verify_filtered_data(filteredSamples)
             raise
 
-    def __create_bin_frequency_data_for_FFT(self, fftBinCount):
-        '''
-        Build the list of bin frequencies for a FFT with a given bin count and
-        made from samples with a given sample frequency
-        '''
-
-        # Only change the current self.xFreq if something that would cause it to
-        # change is itself changed
-        if (fftBinCount != self.lastBinCount) or (self.lastRate != self.RATE):
-            try:
-                self.xFreq = np.fft.rfftfreq(fftBinCount, 1.0 / self.RATE)
-                self.lastRate = self.RATE
-                self.lastBinCount = fftBinCount
-            except:
-                qCDebug(self.logCategory, "Exception in FFT frequency bin generation")
-                raise
+        return filteredSamples, filterZI
 
     def __do_FFT(self):
         '''
-        Perform a FFT conversion of linear samples. Caller MUST hold
-        object lock
-        FIXME: This currently repeats previous work by going through the whole
-               sample set every time it's operational. Modify it to only deal
-               with new sample data.
+        Perform a FFT conversion of linear samples. Only the audio thread calls
+        this and it MUST NOT hold the object lock. Frames are transformed in
+        batches of up to fftBatchFrames, the object lock is only taken to copy
+        each batch out of the sample stream and to add its transforms to the
+        sum, the filter and transforms are done without it so that the audio
+        thread isn't held up by them.
         FIXME: There's some duplication here, e.g. fftFrameEnd
         '''
 
+        # Take what we need from class state in one lock period. The window,
+        # filter and work area can be replaced while we work, we keep using the
+        # ones we took
+        self.__lock()
+
         # How big is a FFT frame, use it to calculate an overlap length when
         # we have a window function
         fftFrameSize = self.__fft_frame_size
-        if self.fnWindow is None:
+        fnWindow = self.fnWindow
+        if fnWindow is None:
             # No window functiom, no overlap
             overlapLength = 0
         else:
             # Use a window overlap
             overlapLength = int(self.windowOverlapRatio * fftFrameSize)
+        windowedSamples = self.windowedSamples
+        fftTransformLen = self.fftTransformLen
+        fftPower = self.fftPower
+        fftBatchPower = self.fftBatchPower
+
+        # Samples added to the stream since we last filtered it. The capture
+        # adds raw samples so that it isn't doing the filtering a frame at a
+        # time, they're filtered here in one go. Take a copy to filter while
+        # not holding the lock, the stream can be replaced if it's grown
+        filterSOS = self.filterSOS
+        filterZI = self.filterZI
+        nFilterStart = self.nFilteredStream
+        nFilterEnd = self.nSampleStream
+        if (filterSOS is not None) and (nFilterEnd > nFilterStart):
+            newSamples = self.sampleStream[nFilterStart:nFilterEnd].copy()
+        else:
+            newSamples = None
+        self.nFilteredStream = nFilterEnd
 
-        # FIXME: This uses lots of try/except blocks, including called functions
-        #        in order to isolate any bug to one operation
-        try:
-            # get the start and end sample and length for the frame we
-            # are at
-            fftFrameStart, fftFrameEnd, fftFrameLen =\
-                    self.__get_initial_frame_limits(overlapLength)
-            # qCDebug(self.logCategory, "FFT stream frame {}..{}/{} ({}) whole length {}".format(fftFrameStart, fftFrameEnd, fftFrameLen, fftFrameEnd - fftFrameStart, self.sampleStream.size))
-
-            # The total number of new samples and where we must end transforming
-            nSamples = self.nSampleStream - self.fftActiveStart
-            minimumSamples = self.fftMinimumSampleFrame * fftFrameSize
-            transformEnd = nSamples - minimumSamples
-
-            # If there is at least the minimum number of samples
-            # qCDebug(self.logCategory, "Looping {} byte frames from {} to {} of ".format(fftFrameSize, transformStart, transformEnd, self.sampleStream.size))
-            while fftFrameEnd < transformEnd:
+        # get the start and end sample and length for the frame we are at
+        fftFrameStart, fftFrameEnd, fftFrameLen =\
+                self.__get_initial_frame_limits(overlapLength)
+        # qCDebug(self.logCategory, "FFT stream frame {}..{}/{} ({}) whole length {}".format(fftFrameStart, fftFrameEnd, fftFrameLen, fftFrameEnd - fftFrameStart, self.sampleStream.size))
+
+        # Where we must end transforming, the end of the samples in the
+        # stream. Only __do_FFT() drops samples from the stream and only the
+        # audio thread calls it, so samples before this point stay where they
+        # are until we finish
+        transformEnd = self.nSampleStream
+
+        self.__unlock()
+
+        # Filter the new samples and put them back in the stream, unless the
+        # filter was changed while we did it. Those samples are then left as
+        # they were captured and the new filter starts after them
+        if newSamples is not None:
+            filteredSamples, filterZI = self.__apply_any_filter(newSamples,
+                                                                filterSOS,
+                                                                filterZI)
+            newSamples = None
+
+            self.__lock()
+            if self.filterSOS is filterSOS:
+                self.sampleStream[nFilterStart:nFilterEnd] = filteredSamples
+                self.filterZI = filterZI
+            self.__unlock()
+
+            filteredSamples = None
+
+        # Frames start this far apart, it's the same for every frame
+        fftFrameHop = fftFrameLen - overlapLength
+
+        # If there is at least the minimum number of samples
+        # qCDebug(self.logCategory, "Looping {} byte frames from {} to {} of ".format(fftFrameSize, transformStart, transformEnd, self.sampleStream.size))
+        while fftFrameEnd <= transformEnd:
+            # How many whole frames fit before the end, up to a batch
+            nFrames = 1 + int((transformEnd - fftFrameEnd) / fftFrameHop)
+            nFrames = min(nFrames, windowedSamples.shape[0])
+            batchEnd = fftFrameEnd + (nFrames - 1) * fftFrameHop
+
+            # A failure in a batch ends the loop, the frames are left for the
+            # next time
+            try:
+                # Window the frames into the windowed sample work area, a row
+                # each. It's all we need the lock for, the audio thread can
+                # replace the sample stream when it grows it. The frames are a
+                # strided view of the stream so they aren't copied before
+                # they're windowed
+                # qCDebug(self.logCategory, "FFT stream frames {}..{} ({}) of {}".format(fftFrameStart, batchEnd, nFrames, self.sampleStream.size))
+                frameSamples = windowedSamples[:nFrames, :fftFrameLen]
+                self.__lock()
                 try:
-                    # Get the frame
-                    # qCDebug(self.logCategory, "FFT stream frame {}..{}/{} ({}) of {}".format(fftFrameStart, fftFrameEnd, fftFrameLen, fftFrameEnd - fftFrameStart, self.sampleStream.size))
-                    self.frameSamples = self.sampleStream[fftFrameStart:fftFrameEnd]
-                    self.nFrameSamples = fftFrameLen
-
-                    # Apply window and filter if they exist
-                    self.__apply_any_window_function()
-                    self.__apply_any_filter()
-
-                    try:
-                        # FFT the windowed, filtered signal
-                        tmpFFT = np.fft.rfft(self.filteredSamples,
-                                             norm="backward")
-
-                        # No longer need these, drop any cross-reference they have
-                        # to sample data
-                        self.filteredSamples = None
-                        self.frameSamples = None
-                        self.nFrameSamples = 0
-
-                        if tmpFFT is None:
-                            qCDebug(self.logCategory, "None FFT at start {}".format(fftStart))
-                    except:
-                        self.filteredSamples = None
-                        self.frameSamples = None
-                        self.nFrameSamples = 0
-                        qCDebug(self.logCategory, "Exception in FFT")
-                        raise
-
-                    # Get the frequencies for FFT bins, it does it's own
-                    # avoidance of repeating the arithmetic if the things that
-                    # would have the same result as the last time
-                    self.__create_bin_frequency_data_for_FFT(int(fftFrameLen / 2) + 1)
-
-                    try:
-                        # Use absolute FFT values
-                        tmpFFT = np.abs(tmpFFT)
-                        binMin = np.min(tmpFFT)
-                        binMax = np.max(tmpFFT)
-                    except:
-                        qCDebug(self.logCategory, "Exception in trimming FFT state")
-                        raise
-
-                    try:
-                        # Sum them (caller resets the sum when desired)
-                        if self.accumFFTSums == 0:
-                            self.fftSum = tmpFFT
-                            self.accumFFTSums = 1
-                        else:
-                            self.fftSum += tmpFFT
-                            self.accumFFTSums += 1
-
-                        # Release state with references we are finished with
-                        tmpFFT = None
-
-                        # Finished a frame, move forward by a frame, it updates
-                        # self.fftActiveStart
-                        fftFrameStart, fftFrameEnd =\
-                                self.__get_next_frame_limits(fftFrameStart,
-                                                             fftFrameLen,
-                                                             overlapLength)
-                    except:
-                        qCDebug(self.logCategory, "Exception in summing FFTs")
-                        raise
-                except:
-                    # End the loop
-                    break
-        except ValueError:
-            # Under-run or over-run, let it pass because we are capturing data
-            # live. fftActiveStart won't change between iterations when this
-            # happens
-            msg = "Not enough sample data ({}) ".format(self.nSampleStream)
-            msg += "to perform FFT yet"
-            qCDebug(self.logCategory, msg)
+                    streamSamples = self.sampleStream[fftFrameStart:batchEnd]
+                    streamSamples = sliding_window_view(streamSamples,
+                                                        fftFrameLen)
+                    streamSamples = streamSamples[::fftFrameHop]
+                    self.__apply_any_window_function(streamSamples, fnWindow,
+                                                     frameSamples)
+                    streamSamples = None
+                finally:
+                    self.__unlock()
+
+                # FFT the windowed signals, padded to the transform length.
+                # The stream was filtered at the top of __do_FFT(), except for
+                # samples captured across a filter change, they stay
+                # unfiltered. The windowed buffer is our own work area so let
+                # the FFT overwrite it, that means the padding is re-zeroed
+                # first
+                frameSamples = windowedSamples[:nFrames]
+                frameSamples[:, fftFrameLen:] = 0
+                tmpFFT = _rfft_power(frameSamples, fftTransformLen,
+                                     fftPower[:nFrames])
+                frameSamples = None
+
+                # One power spectrum for the batch, added to the sum in one go
+                tmpFFT = np.sum(tmpFFT, axis=0, out=fftBatchPower)
+            except Exception as e:
+                msg = "Exception in FFT of frames "
+                msg += "{}..{}: {}".format(fftFrameStart, batchEnd, e)
+                qCDebug(self.logCategory, msg)
+                break
+
+            # Sum them (caller resets the sum when desired). The sum is added
+            # to in place
+            self.__lock()
+
+            # A transform of the old length is dropped rather than replacing
+            # the new sum
+            if self.fftSum.size == tmpFFT.size:
+                np.add(self.fftSum, tmpFFT, out=self.fftSum)
+                self.accumFFTSums += nFrames
+
+            # Finished a batch, move forward by its frames, it updates
+            # self.fftActiveStart
+            fftFrameStart, fftFrameEnd =\
+                    self.__get_next_frame_limits(fftFrameStart, fftFrameLen,
+                                                 overlapLength, nFrames)
+
+            self.__unlock()
+
+            # Release state with references we are finished with
+            tmpFFT = None
 
         # New active frame position
         # msg = "NEXT FFT will start from {}".format(self.fftActiveStart)
@@ -1292,7 +1622,9 @@ class qtmAudioRxThread(QThread):
 
         # As long as we are longer than the minimum length we can discard
         # early frames. Let the function work it out
+        self.__lock()
         self.__drop_redundant_samples()
+        self.__unlock()
 
     def __preset_fft_state(self):
         '''
@@ -1305,7 +1637,9 @@ class qtmAudioRxThread(QThread):
         # allows us to have better overlapping windows
         fftFrameSize = self.__fft_frame_size
         self.nSampleStream = self.fftMinimumSampleFrame * fftFrameSize
-        self.sampleStream = np.zeros(self.nSampleStream)
+        self.sampleStream = np.zeros(self.__fft_stream_capacity,
+                                     dtype=np.float32)
+        self.nFilteredStream = self.nSampleStream
 
         self.fftFrameCount = self.frames_in_stream
 
@@ -1317,18 +1651,49 @@ class qtmAudioRxThread(QThread):
 
         self.yieldCurrentThread()
 
+    @property
+    def __fft_stream_capacity(self):
+        '''
+        Return the number of samples to allocate for the FFT sample stream.
+        Enough for the frames kept for window overlap plus a batch of FFTs with
+        the same again as headroom for the capture getting ahead of the FFTs.
+        '''
+
+        fftFrameSize = self.__fft_frame_size
+        nSamples = 2 * self.fftMinimumSampleFrame * fftFrameSize
+        nSamples += int(self.batchFFTDuration * self.RATE)
+
+        return 2 * nSamples
+
+    def __grow_sample_stream(self, nRequired):
+        '''
+        Replace the sample stream with a larger one that can hold at least
+        nRequired samples, keeping the samples in use. This should be rare, it
+        only happens when FFTs have not kept up with the capture. Caller MUST
+        hold object lock
+        '''
+
+        newSize = max(2 * self.sampleStream.size, nRequired)
+        newStream = np.zeros(newSize, dtype=self.sampleStream.dtype)
+        newStream[:self.nSampleStream] = self.sampleStream[:self.nSampleStream]
+        self.sampleStream = newStream
+
     def __add_fft_stream_samples(self, newSamples):
         '''
-        Add newSamples to the sample stream and if it's getting long then
-        perform FFTs. Caller MUST hold object lock
+        Add newSamples to the sample stream and return True if it's getting
+        long enough that FFTs should be performed. Caller MUST hold object lock,
+        the FFTs must be done by the caller after releasing it
         '''
 
-        # Concatenate the sample data to the stream we'll use for
-        # computing FFTs
-        self.sampleStream = np.concatenate( [ self.sampleStream, newSamples] )
+        # Copy the sample data into the stream we'll use for computing FFTs
+        # after the samples already there
+        nStream = self.nSampleStream + newSamples.size
+        if nStream > self.sampleStream.size:
+            self.__grow_sample_stream(nStream)
+        self.sampleStream[self.nSampleStream:nStream] = newSamples
 
         # New size in samples, time and FFT frames
-        self.nSampleStream += newSamples.size
+        self.nSampleStream = nStream
         tSamples = self.nSampleStream / self.RATE
         fftFrameSize = self.__fft_frame_size
         self.fftFrameCount = int(self.nSampleStream / fftFrameSize)
@@ -1346,7 +1711,7 @@ class qtmAudioRxThread(QThread):
         # width bins. Adjust the whole via self.tFFTUnit or re-write
 
         # Duration of sample frames we have not yet transformed
-        newSamples = self.nSampleStream - (self.tFFTUnit * self.fftAciveFrame)
+        newSamples = self.nSampleStream - self.fftActiveStart
         newFrames = int(newSamples / fftFrameSize)
         tNewFrameSamples = newFrames * fftFrameSize / self.RATE
 
@@ -1360,20 +1725,62 @@ class qtmAudioRxThread(QThread):
         # msg += "with limit {}. ".format(tLimit)
         # msg += "Sample duration {}. ".format(tSamples)
         # qCDebug(self.logCategory, msg)
-        if tStep > 0:
-            # msg += "Performing FFT..."
-            # qCDebug(self.logCategory, msg)
-            self.__do_FFT()
+        # Also do them early if fft_data() has asked for them
+        fftDue = (tStep > 0) or self.fftRequested
+        self.fftRequested = False
+
+        # msg += "Performing FFT..."
+        # qCDebug(self.logCategory, msg)
+        return fftDue
+
+    def __frame_mean_amplitudes(self, samples, nFrameSamples):
+        '''
+        Return a list of the mean absolute amplitude of each captured sample
+        frame in samples, nFrameSamples is the number of samples in each frame.
+        The absolute values of all of the frames are written to the absSamples
+        work area rather than a new array each time and each frame is summed
+        with a double precision accumulator in one reduction. The results are
+        plain Python floats so that the scalar arithmetic done with them under
+        the object lock isn't numpy scalar arithmetic.
+        '''
+
+        nSamples = samples.size
+        if nSamples > self.absSamples.size:
+            self.absSamples = np.empty(nSamples, dtype=np.float32)
+        absSamples = self.absSamples[:nSamples]
+
+        np.abs(samples, out=absSamples)
+
+        # Sum each frame from where it starts in the samples
+        nFrameSamples = np.array(nFrameSamples)
+        frameStarts = np.cumsum(nFrameSamples) - nFrameSamples
+        frameSums = np.add.reduceat(absSamples, frameStarts, dtype=np.float64)
+
+        return (frameSums / nFrameSamples).tolist()
 
     def __reset_stream_amplitude(self):
         '''
         When the stream is started we need to reset the sample tracking data
         in case we had previously been running and have current data
         '''
-        self.sampleFrameAmplitudes = []
-        self.nSampleFrameAmplitudes = 0
+        self.sampleFrameAmplitudes = deque(maxlen=self.meanSampleFrames)
         self.sumSampleFrameAmplitudes = 0
 
+    def __resize_stream_amplitude(self):
+        '''
+        The number of frames in the rolling mean has changed, replace the
+        amplitude deque with one of the new length keeping as many of the most
+        recent amplitudes as will fit. Caller must hold the object lock.
+        '''
+
+        # A bounded deque built from the old one keeps the newest entries
+        self.sampleFrameAmplitudes = deque(self.sampleFrameAmplitudes,
+                                           maxlen=self.meanSampleFrames)
+
+        # Re-sum what we kept rather than adjusting the old sum, it also drops
+        # any rounding error accumulated by the old sum
+        self.sumSampleFrameAmplitudes = math.fsum(self.sampleFrameAmplitudes)
+
     def __add_stream_amplitude(self, frameAmplitude):
         '''
         Add a new amplitude to the tracked amplitude data, keeping the length
@@ -1381,109 +1788,65 @@ class qtmAudioRxThread(QThread):
         lock.
         '''
 
-        # If we have reached or exceeded the audio window, remove the oldest
-        # entries from the sum and the list
-        # FIXME: If the del happens a lot then slice might be faster
-        while self.nSampleFrameAmplitudes >= self.meanSampleFrames:
+        # Once the deque is full the append evicts the oldest entry, remove it
+        # from the sum first
+        if len(self.sampleFrameAmplitudes) == self.sampleFrameAmplitudes.maxlen:
             self.sumSampleFrameAmplitudes -= self.sampleFrameAmplitudes[0]
-            del self.sampleFrameAmplitudes[0]
-            self.nSampleFrameAmplitudes -= 1
 
-        # Add the new amplitude to the list and sum
         self.sampleFrameAmplitudes.append(frameAmplitude)
-        self.nSampleFrameAmplitudes += 1
         self.sumSampleFrameAmplitudes += frameAmplitude
 
     def run(self):
         '''
-        Thread runtime entry point. Function contains several uses of sleep due
-        to the multiple long duration operations on large data sets.
+        Thread runtime entry point. Waits for each frame of sample data from the
+        audio stream callback, there's no need to sleep between frames.
         FIXME: Find ways to reduce the overhead of running this
         '''
 
         self.__start_audio()
         if self.__audio_open:
-            # We'll track some things that should not change or at least change
-            # rarely in the loop so that we can reduce some math. Start with
-            # invalid values to detect a difference from. There is a class
-            # version of lastRate for the same purpose of detecting when RATE
-            # changes but we need our own version because the class one can be
-            # set equal to RATE in other places
-            lastRate = 0
-            lastSamplesPerFrame = 0
-
-            # Keep a count since our last yield in the loop that runs until
-            # asked to stop
-            i = 0
             while not self.endRun:
                 try:
-                    capStart = time.time()
-                    sampleFrame = self.__capture_audio_sample_frame()
+                    # Everything captured since the last time around, in one
+                    # pass and one lock period
+                    sampleFrame, nFrameSamples =\
+                            self.__capture_audio_sample_frames()
                     if sampleFrame is not None:
                         # Get the magnitude of the samples and use it to get the
-                        # mean, without the abs() we'd have a mean signal of
-                        # about zero
-                        # FIXME: this walks through the level data the way that
-                        #        displaying FFT walks through the same data in
-                        #        the frequency domain. Perhaps they can be
-                        #        combined
-                        # FIXME: Find a way to not do these two every loop
-                        absFrame = np.abs(sampleFrame)
-                        frameAmplitude = np.mean(absFrame)
+                        # mean of each frame, without the abs() we'd have a mean
+                        # signal of about zero. It's a pass over the whole
+                        # batch, the copy into the FFT stream below is the only
+                        # other one. The FFTs read the stream later, after any
+                        # filter, so they can't share a pass with it
+                        frameAmplitudes =\
+                                self.__frame_mean_amplitudes(sampleFrame,
+                                                             nFrameSamples)
 
                         # Protect access to updates of class state
                         self.__lock()
 
                         # Track the amplitudes as we cycle, limiting the number
                         # to enough to fill the audio window
-                        self.__add_stream_amplitude(frameAmplitude)
+                        for frameAmplitude in frameAmplitudes:
+                            self.__add_stream_amplitude(frameAmplitude)
 
-                        # Track sample data. This will automatically perform FFT
-                        # transforms when the untransformed sample stream is
-                        # getting long
-                        self.__add_fft_stream_samples(sampleFrame)
+                        # Track sample data. This tells us when the
+                        # untransformed sample stream is getting long. Stereo
+                        # samples are interleaved, the spectrum is of the
+                        # first channel which is a view of every other sample.
+                        # Any filter is applied when the FFTs are done
+                        fftSamples = sampleFrame[::self.CHANNELS]
+                        fftDue = self.__add_fft_stream_samples(fftSamples)
 
                         # End of protected updates
                         self.__unlock()
 
-                        # Periodic yield outside of the lock but in the loop
-                        # while handling sample data, we definately yielded if
-                        # there was no sample data (IOError).
-                        i += 1
-                        # if i >= 3:
-                        #     self.yieldCurrentThread()
-                        #     i = 0
+                        # Perform FFT transforms outside of the object lock
+                        if fftDue:
+                            self.__do_FFT()
                 except IOError:
-                    # No data, yield allowing for received audio to queue
-                    i = 0
-
-                # Only compute the sleep time if anything used to compute it
-                # changes
-                curSamplesPerFrame = self.samples_per_frame
-                if (curSamplesPerFrame != lastSamplesPerFrame) or \
-                        (self.RATE != lastRate):
-                    # Even at the fastest expected sample rate we are going
-                    # to want to sleep for about 6ms, so do it in msleep. We
-                    # get a fraction of a second from the division, we want
-                    # integer milliseconds for the msleep argument
-                    # FIXME: This doesn't account for the sample for
-                    #        multiple channels having the same time
-                    #        reference, i.e. mono would have the correct
-                    #        time but stereo would be twice as long for no
-                    #        purpose.
-                    reUseSleepTime = 1 + int(1000.0 * curSamplesPerFrame / self.RATE)
-                    lastSamplesPerFrame = curSamplesPerFrame
-                    lastRate = self.RATE
-
-                # Sleep the re-used time less this loop iteration's elapsed time
-                # and if there is no time, yield every so often
-                msSleep = reUseSleepTime - round(1000 * (time.time() - capStart))
-                if msSleep > 0:
-                    self.msleep(msSleep)
-                else:
-                    if i >= 3:
-                        self.yieldCurrentThread()
-                        i = 0
+                    # No data, go around and check if we should stop
+                    pass
 
         # End of main run loop, stop the audio
         self.__stop_audio()
@@ -1,5 +1,5 @@
 # This Python file uses the following encoding: utf-8
-from PySide6.QtCore import (Qt, QLoggingCategory, qCDebug)
+from PySide6.QtCore import (Qt, QLoggingCategory, QSignalBlocker)
 from PySide6.QtWidgets import (QColorDialog, QDialog, QGraphicsScene)
 
 from PySide6.QtGui import (QBrush, QColor)
@@ -8,6 +8,11 @@ from dlgQtMSettings import Ui_dlgSettings
 
 from qtmTODMath import qtmTODMath
 
+# Step of the floating point lat/lon controls, one arc-second (1 / 3600) to the
+# 8 decimals they hold. The seconds shown for an angle are rounded to the
+# nearest, so the small error in the step doesn't show
+ARC_SECOND_STEP = 0.00027778
+
 class dlgSettings(QDialog):
     '''
     Settings dialog class for QtMeter application
@@ -16,18 +21,18 @@ class dlgSettings(QDialog):
     and modify settings for the QtMeter application.
     '''
 
-    todCalc = qtmTODMath()
-    ignoreLatLonChanged = False
-
-    minColor = QColor("green")
-    maxColor = QColor("red")
-    spectrumColor = QColor("yellow")
+    # Whether the low and high frequency controls are used by each filter type,
+    # any other type uses both
+    filterFEnables = {
+        "Low pass": (False, True),
+        "High pass": (True, False),
+        "Band pass": (True, True),
+        "Band stop": (True, True),
+    }
 
-    # This is used to prevent recursive signals when we use coupled spinboxes
-    # and have to update the other when we update each. The coupling case is
-    # to keep the high frequency filter limit above the low frequency filter
-    # limit and vice-versa.
-    fixingF = False
+    # QColors parsed from color names by set_colors(), shared by all dialogs
+    # so that each name is only parsed once
+    namedColors = {}
 
     logCategory = QLoggingCategory("QtMeter.Dialog.Settings")
 
@@ -39,12 +44,47 @@ class dlgSettings(QDialog):
 
         super(dlgSettings, self).__init__()
 
+        # Instance state is made here rather than at class level so that it
+        # isn't shared between dialogs or made before a dialog is
+        self.todCalc = qtmTODMath()
+
+        # Default green, red and yellow, as RGB rather than names to parse
+        self.minColor = QColor(0, 128, 0)
+        self.maxColor = QColor(255, 0, 0)
+        self.spectrumColor = QColor(255, 255, 0)
+
+        # The brushes the color swatches are filled with, their color is
+        # changed with the color they show
+        self.minBrush = QBrush(self.minColor)
+        self.maxBrush = QBrush(self.maxColor)
+        self.specBrush = QBrush(self.spectrumColor)
+
         # self.load_ui()
         self.ui = Ui_dlgSettings()
         self.ui.setupUi(self)
+
+        # The lat/lon controls enabled for each input format, the degrees,
+        # minutes and seconds or the floating point degrees
+        sUI = self.ui
+        self.dmsWidgets = (sUI.sbLatDegrees, sUI.lblLatDegrees,
+                           sUI.sbLatMinutes, sUI.lblLatMinutes,
+                           sUI.sbLatSeconds, sUI.lblLatSeconds,
+                           sUI.sbLonDegrees, sUI.lblLonDegrees,
+                           sUI.sbLonMinutes, sUI.lblLonMinutes,
+                           sUI.sbLonSeconds, sUI.lblLonSeconds)
+        self.floatWidgets = (sUI.dsbLatFloat, sUI.lblLatFloat,
+                             sUI.dsbLonFloat, sUI.lblLonFloat)
+
+        # The index of each item in the filter and window function combo boxes
+        # by it's text. The items are fixed in the UI design so the combo boxes
+        # don't need searching for them every time
+        self.filterIndexes = self.__combo_box_indexes(sUI.cbFilterType)
+        self.windowFnIndexes = self.__combo_box_indexes(sUI.cbWindowFn)
+
         self.ui.rbDMS.toggle()
         self.enable_lat_lon_input()
-        self.ui.dsbLatFloat.setSingleStep(0.00027778)
+        self.ui.dsbLatFloat.setSingleStep(ARC_SECOND_STEP)
+        self.ui.dsbLonFloat.setSingleStep(ARC_SECOND_STEP)
 
         # These don't work in UI design
         alignmentFlag = Qt.AlignRight
@@ -57,6 +97,18 @@ class dlgSettings(QDialog):
         self.ui.sbLonSeconds.setAlignment(alignmentFlag)
         self.ui.dsbLonFloat.setAlignment(alignmentFlag)
 
+        # Keep the high frequency filter limit above the low frequency filter
+        # limit and vice-versa by limiting the range of each to the other. The
+        # UI design starts the high frequency at the bottom of its range, which
+        # would leave no range for the low frequency, start it at the top.
+        self.ui.sbHighF.setValue(self.ui.sbHighF.maximum())
+        self.audio_filter_low_f_changed(self.ui.sbLowF.value())
+        self.audio_filter_high_f_changed(self.ui.sbHighF.value())
+
+        # The filter type the UI design starts with won't signal a change,
+        # enable the frequency controls it uses
+        self.audio_filter_type_changed(self.ui.cbFilterType.currentText())
+
         self.connectControls()
 
     def set_latitude(self, newLat):
@@ -126,7 +178,7 @@ class dlgSettings(QDialog):
 
         lat = self.ui.dsbLatFloat.value()
         if self.ui.rbLatSouth.isChecked():
-            lat = 0.0 - lat
+            lat = -lat
 
         return lat
 
@@ -137,7 +189,7 @@ class dlgSettings(QDialog):
 
         lon = self.ui.dsbLonFloat.value()
         if self.ui.rbLonWest.isChecked():
-            lon = 0.0 - lon
+            lon = -lon
 
         return lon
 
@@ -153,25 +205,11 @@ class dlgSettings(QDialog):
                 to enable the floating point degrees controls.
         '''
 
-        self.ui.sbLatDegrees.setEnabled(isDMS)
-        self.ui.lblLatDegrees.setEnabled(isDMS)
-        self.ui.sbLatMinutes.setEnabled(isDMS)
-        self.ui.lblLatMinutes.setEnabled(isDMS)
-        self.ui.sbLatSeconds.setEnabled(isDMS)
-        self.ui.lblLatSeconds.setEnabled(isDMS)
-
-        self.ui.dsbLatFloat.setEnabled(not isDMS)
-        self.ui.lblLatFloat.setEnabled(not isDMS)
+        for widget in self.dmsWidgets:
+            widget.setEnabled(isDMS)
 
-        self.ui.sbLonDegrees.setEnabled(isDMS)
-        self.ui.lblLonDegrees.setEnabled(isDMS)
-        self.ui.sbLonMinutes.setEnabled(isDMS)
-        self.ui.lblLonMinutes.setEnabled(isDMS)
-        self.ui.sbLonSeconds.setEnabled(isDMS)
-        self.ui.lblLonSeconds.setEnabled(isDMS)
-
-        self.ui.dsbLonFloat.setEnabled(not isDMS)
-        self.ui.lblLonFloat.setEnabled(not isDMS)
+        for widget in self.floatWidgets:
+            widget.setEnabled(not isDMS)
 
     def enable_lat_lon_input(self):
         '''
@@ -186,9 +224,8 @@ class dlgSettings(QDialog):
         Slot for the floating point latitude being changed. A modification
         causes the degrees, minutes and second to be adjusted automatically. In
         the same way adjusting degrees, minutes or seconds will cause the
-        floating point degrees to be adjusted. Since each results in the other
-        being signaled there is a control variable ignoreLatLonChanged used to
-        prevent recursive execution.
+        floating point degrees to be adjusted. The signals of the controls
+        being adjusted are blocked so that each doesn't signal the other.
 
         Parameters
         ----------
@@ -196,32 +233,29 @@ class dlgSettings(QDialog):
                 The new latitude to use
         '''
 
-        # If we are being adjusted by DMS changes do nothing
-        if self.ignoreLatLonChanged:
-            return
-
-        # Use it to set the DMS without looping back valueChanged
-        self.ignoreLatLonChanged = True
-
         # debug_message("lat value changed type {}".format(type(newValue)))
-        deg = abs(self.todCalc.get_angle_degrees(newValue))
-        min = abs(self.todCalc.get_angle_minutes(newValue))
-        sec = abs(self.todCalc.get_angle_seconds(newValue))
+        # Split it in one pass, the parts all have the sign of the angle so
+        # taking the absolute value first is the same as for each part
+        deg, min, sec = self.todCalc.get_angle_DMS(abs(newValue))
         # debug_message("\\_ {} == {} {} {}".format(newValue, deg, min, sec))
-        self.ui.sbLatDegrees.setValue(deg)
-        self.ui.sbLatMinutes.setValue(min)
-        self.ui.sbLatSeconds.setValue(sec)
+        sUI = self.ui
 
-        self.ignoreLatLonChanged = False
+        # Set the DMS without them signaling back to here
+        with QSignalBlocker(sUI.sbLatDegrees),\
+                QSignalBlocker(sUI.sbLatMinutes),\
+                QSignalBlocker(sUI.sbLatSeconds):
+            sUI.sbLatDegrees.setValue(deg)
+            sUI.sbLatMinutes.setValue(min)
+            sUI.sbLatSeconds.setValue(sec)
 
     def new_lat_DMS(self, value):
         '''
         Slot for the latitude degrees, minutes or seconds being changed. A
         modification causes the floating point degrees to be adjusted
         automatically. In the same way adjusting floating point degrees will
-        cause the degrees, minutes and seconds to be adjusted. Since each
-        results in the other being signaled there is a control variable
-        ignoreLatLonChanged used to prevent recursive execution.
+        cause the degrees, minutes and seconds to be adjusted. The signals of
+        the control being adjusted are blocked so that each doesn't signal the
+        other.
 
         This slot is used for all three of degrees, minutes and seconds so the
         value parameter is not used and the values of all three read from the
@@ -233,33 +267,24 @@ class dlgSettings(QDialog):
                 The new value
         '''
 
-        # If we are being adjusted by float degrees changes do nothing
-        if self.ignoreLatLonChanged:
-            return
-
-        # Use them to set the float without looping back valueChanged
-        self.ignoreLatLonChanged = True
-
         # Just get the three of them
         deg = self.ui.sbLatDegrees.value()
         min = self.ui.sbLatMinutes.value()
         sec = self.ui.sbLatSeconds.value()
 
-        # Compute and set the float value
+        # Compute and set the float value without it signaling back to here
         fDegs = self.todCalc.get_DMS_angle_float(deg, min, sec)
         # fDegs = self.todCalc.getDMSFloat(deg, min, sec)
-        self.ui.dsbLatFloat.setValue(fDegs)
-
-        self.ignoreLatLonChanged = False
+        with QSignalBlocker(self.ui.dsbLatFloat):
+            self.ui.dsbLatFloat.setValue(fDegs)
 
     def new_lon_float(self, newValue):
         '''
         Slot for the floating point longitude being changed. A modification
         causes the degrees, minutes and second to be adjusted automatically. In
         the same way adjusting degrees, minutes or seconds will cause the
-        floating point degrees to be adjusted. Since each results in the other
-        being signaled there is a control variable ignoreLatLonChanged used to
-        prevent recursive execution.
+        floating point degrees to be adjusted. The signals of the controls
+        being adjusted are blocked so that each doesn't signal the other.
 
         Parameters
         ----------
@@ -267,32 +292,29 @@ class dlgSettings(QDialog):
                 The new logitude to use
         '''
 
-        # If we are being adjusted by DMS changes do nothing
-        if self.ignoreLatLonChanged:
-            return
-
-        # Use it to set the DMS without looping back valueChanged
-        self.ignoreLatLonChanged = True
-
         # debug_message("lat value changed type {}".format(type(newValue)))
-        deg = abs(self.todCalc.get_angle_degrees(newValue))
-        min = abs(self.todCalc.get_angle_minutes(newValue))
-        sec = abs(self.todCalc.get_angle_seconds(newValue))
+        # Split it in one pass, the parts all have the sign of the angle so
+        # taking the absolute value first is the same as for each part
+        deg, min, sec = self.todCalc.get_angle_DMS(abs(newValue))
         # debug_message("\\_ {} == {} {} {}".format(newValue, deg, min, sec))
-        self.ui.sbLonDegrees.setValue(deg)
-        self.ui.sbLonMinutes.setValue(min)
-        self.ui.sbLonSeconds.setValue(sec)
+        sUI = self.ui
 
-        self.ignoreLatLonChanged = False
+        # Set the DMS without them signaling back to here
+        with QSignalBlocker(sUI.sbLonDegrees),\
+                QSignalBlocker(sUI.sbLonMinutes),\
+                QSignalBlocker(sUI.sbLonSeconds):
+            sUI.sbLonDegrees.setValue(deg)
+            sUI.sbLonMinutes.setValue(min)
+            sUI.sbLonSeconds.setValue(sec)
 
     def new_lon_DMS(self, value):
         '''
         Slot for the longitude degrees, minutes or seconds being changed. A
         modification causes the floating point degrees to be adjusted
         automatically. In the same way adjusting floating point degrees will
-        cause the degrees, minutes and seconds to be adjusted. Since each
-        results in the other being signaled there is a control variable
-        ignoreLatLonChanged used to prevent recursive execution.
+        cause the degrees, minutes and seconds to be adjusted. The signals of
+        the control being adjusted are blocked so that each doesn't signal the
+        other.
 
         This slot is used for all three of degrees, minutes and seconds so the
         value parameter is not used and the values of all three read from the
@@ -304,92 +326,90 @@ class dlgSettings(QDialog):
                 The new value
         '''
 
-        # If we are being adjusted by float degrees changes do nothing
-        if self.ignoreLatLonChanged:
-            return
-
-        # Use them to set the float without looping back valueChanged
-        self.ignoreLatLonChanged = True
-
         # Just get the three of them
         deg = self.ui.sbLonDegrees.value()
         min = self.ui.sbLonMinutes.value()
         sec = self.ui.sbLonSeconds.value()
 
-        # Compute and set the float value
+        # Compute and set the float value without it signaling back to here
         fDegs = self.todCalc.get_DMS_angle_float(deg, min, sec)
         # fDegs = self.todCalc.getDMSFloat(deg, min, sec)
-        self.ui.dsbLonFloat.setValue(fDegs)
+        with QSignalBlocker(self.ui.dsbLonFloat):
+            self.ui.dsbLonFloat.setValue(fDegs)
 
-        self.ignoreLatLonChanged = False
+    def __fill_color_swatch(self, view, brush, newColor):
+        '''
+        Fill the scene of a color swatch graphics view with a color, creating
+        the scene if the view doesn't have one yet
+        Parameters
+        ----------
+            view: the QGraphicsView of the swatch
+            brush: the QBrush kept for the swatch, it's changed to newColor
+            newColor: the QColor to show
+        '''
 
-    def set_spec_color(self, newColor):
-        self.spectrumColor = newColor
-        view = self.ui.gvSpectrumColor
         scene = view.scene()
         if scene is None:
             scene = QGraphicsScene()
             view.setScene(scene)
 
         # Fill it with the chosen color
-        specBrush = QBrush(self.spectrum_color)
-        scene.setBackgroundBrush(specBrush)
-        scene.clear()
+        # scene.setSceneRect(0.0, 0.0, self.usefulWidth, useHeight)
+        brush.setColor(newColor)
+        scene.setBackgroundBrush(brush)
+
+        # Setting the brush repaints the background, only clear the scene if
+        # there is anything in it to remove
+        if len(scene.items()) > 0:
+            scene.clear()
+
+    def __choose_color(self, curColor, setColor):
+        '''
+        Let the user choose a new color starting from curColor, if they do use
+        setColor to set it
+        Parameters
+        ----------
+            curColor: the current QColor
+            setColor: the method to set the chosen QColor with
+        '''
+
+        newColor = QColorDialog.getColor(curColor)
+        if newColor.isValid():
+            setColor(newColor)
+
+    def set_spec_color(self, newColor):
+        self.spectrumColor = newColor
+        self.__fill_color_swatch(self.ui.gvSpectrumColor, self.specBrush,
+                                 newColor)
 
     @property
     def spectrum_color(self):
         return self.spectrumColor
 
     def new_spec_color(self):
-        newColor = QColorDialog.getColor(self.spectrumColor)
-        if newColor.isValid():
-            self.setSpectrumColor(newColor)
+        self.__choose_color(self.spectrumColor, self.set_spec_color)
 
     def set_max_level_color(self, newColor):
         self.maxColor = newColor
-        view = self.ui.gvMaxColor
-        scene = view.scene()
-        if scene is None:
-            scene = QGraphicsScene()
-            view.setScene(scene)
-
-        # Fill it with the chosen color
-        # scene.setSceneRect(0.0, 0.0, self.usefulWidth, useHeight)
-        maxBrush = QBrush(self.maximum_color)
-        scene.setBackgroundBrush(maxBrush)
-        scene.clear()
+        self.__fill_color_swatch(self.ui.gvMaxColor, self.maxBrush, newColor)
 
     @property
     def maximum_color(self):
         return self.maxColor
 
     def new_max_color(self):
-        newColor = QColorDialog.getColor(self.maxColor)
-        if newColor.isValid():
-            self.setMaxLevelColor(newColor)
+        self.__choose_color(self.maxColor, self.set_max_level_color)
 
     def set_min_level_color(self, newColor):
         self.minColor = newColor
-        view = self.ui.gvMinColor
-        scene = view.scene()
-        if scene is None:
-            scene = QGraphicsScene()
-            view.setScene(scene)
-
-        # Fill it with the chosen color
-        # scene.setSceneRect(0.0, 0.0, self.usefulWidth, useHeight)
-        minBrush = QBrush(self.minimum_color)
-        scene.setBackgroundBrush(minBrush)
-        scene.clear()
+        self.__fill_color_swatch(self.ui.gvMinColor, self.minBrush, newColor)
 
     @property
     def minimum_color(self):
         return self.minColor
 
     def new_min_color(self):
-        newColor = QColorDialog.getColor(self.minColor)
-        if newColor.isValid():
-            self.setMinLevelColor(newColor)
+        self.__choose_color(self.minColor, self.set_min_level_color)
 
     def set_colors(self, newColors):
         '''
@@ -401,10 +421,26 @@ class dlgSettings(QDialog):
                        tuple)
         '''
 
-        self.set_min_level_color(QColor.fromString(newColors[0]))
-        self.set_max_level_color(QColor.fromString(newColors[1]))
-        self.set_spec_color(QColor.fromString(newColors[2]))
+        self.set_min_level_color(self.__named_color(newColors[0]))
+        self.set_max_level_color(self.__named_color(newColors[1]))
+        self.set_spec_color(self.__named_color(newColors[2]))
+
+    def __named_color(self, colorName):
+        '''
+        Return a QColor for a color name, the name is only parsed the first
+        time it's used
+        Parameters
+        ----------
+            colorName: text color name, e.g. "green" or "#008000"
+        '''
+
+        namedColor = self.namedColors.get(colorName)
+        if namedColor is None:
+            namedColor = QColor.fromString(colorName)
+            self.namedColors[colorName] = namedColor
 
+        # A copy so that changing the color returned can't change the cache
+        return QColor(namedColor)
 
     def audio_filter_type_changed(self, newFilter):
         '''
@@ -417,21 +453,7 @@ class dlgSettings(QDialog):
         '''
 
         # qCDebug(self.logCategory, "Filter changed to {}".format(newFilter))
-        if newFilter == "Low pass":
-            loOn = False
-            hiOn = True
-        elif newFilter == "High pass":
-            loOn = True
-            hiOn = False
-        elif newFilter == "Band pass":
-            loOn = True
-            hiOn = True
-        elif newFilter == "Band stop":
-            loOn = True
-            hiOn = True
-        else:
-            loOn = True
-            hiOn = True
+        loOn, hiOn = self.filterFEnables.get(newFilter, (True, True))
 
         sUI = self.ui
         sUI.lblLowF.setEnabled(loOn)
@@ -439,6 +461,20 @@ class dlgSettings(QDialog):
         sUI.lblHighF.setEnabled(hiOn)
         sUI.sbHighF.setEnabled(hiOn)
 
+        # A frequency control the filter type doesn't use mustn't limit the
+        # range of the one it does and the user can't change it, move it to
+        # the extreme of its range. Its change isn't signalled (this is also
+        # used before the signals are connected), the limit it sets on the
+        # other control is updated here.
+        if not hiOn:
+            with QSignalBlocker(sUI.sbHighF):
+                sUI.sbHighF.setValue(sUI.sbHighF.maximum())
+            self.audio_filter_high_f_changed(sUI.sbHighF.value())
+        if not loOn:
+            with QSignalBlocker(sUI.sbLowF):
+                sUI.sbLowF.setValue(sUI.sbLowF.minimum())
+            self.audio_filter_low_f_changed(sUI.sbLowF.value())
+
     def toggle_audio_filter(self, checked):
         '''
         Handle signal from audio filter group box when it is toggled
@@ -449,14 +485,22 @@ class dlgSettings(QDialog):
         '''
 
         if checked is True:
-            self.audio_filter_type_changed(self.ui.cbFilterType.currentText)
+            self.audio_filter_type_changed(self.ui.cbFilterType.currentText())
 
     @property
     def audio_filter_enabled(self):
         return self.ui.gbAudioFilter.isChecked()
 
+    def __combo_box_indexes(self, comboBox):
+        '''
+        Return a dictionary of the index of each item in a combo box by it's
+        text
+        '''
+
+        return {comboBox.itemText(i): i for i in range(comboBox.count())}
+
     def audio_filter_exists(self, filterName):
-        return (self.ui.cbFilterType.findText(filterName) != -1)
+        return (filterName in self.filterIndexes)
 
     @property
     def audio_filter_type(self):
@@ -469,7 +513,8 @@ class dlgSettings(QDialog):
 
     @property
     def audio_filter_low_frequency(self):
-        if self.ui.sbLowF.isEnabled:
+        # The controls are disabled with the filter group box, check that first
+        if self.audio_filter_enabled and self.ui.sbLowF.isEnabled():
             fLim = self.ui.sbLowF.value()
         else:
             # Not used for the current filter type
@@ -479,8 +524,9 @@ class dlgSettings(QDialog):
 
     @property
     def audio_filter_high_frequency(self):
-        if self.ui.sbHighF.isEnabled:
-            fLim =  self.ui.sbHighF.value()
+        # The controls are disabled with the filter group box, check that first
+        if self.audio_filter_enabled and self.ui.sbHighF.isEnabled():
+            fLim = self.ui.sbHighF.value()
         else:
             # Not used for the current filter type
             fLim = -1
@@ -489,7 +535,8 @@ class dlgSettings(QDialog):
 
     @property
     def audio_filter_order(self):
-        if self.ui.sbOrder.isEnabled:
+        # The control is disabled with the filter group box, check that first
+        if self.audio_filter_enabled and self.ui.sbOrder.isEnabled():
             filtOrder = self.ui.sbOrder.value()
         else:
             # Not enabled (default of order 3)
@@ -512,23 +559,55 @@ class dlgSettings(QDialog):
             newFilter: String name of the new filter to select
         '''
 
-        newIndex = self.ui.cbFilterType.findText(newFilter)
+        newIndex = self.filterIndexes.get(newFilter, -1)
         if newIndex != -1:
             self.ui.cbFilterType.setCurrentIndex(newIndex)
 
     def set_audio_filter_low_f(self, newFreq):
         '''
-        Set the audio filter low frequency to newFreq
+        Set the audio filter low frequency to newFreq. If it isn't below the
+        high frequency the high frequency is moved above it first, otherwise
+        the range of the low frequency control would limit it. A frequency
+        outside the range of the controls is ignored, e.g. the -1 used for the
+        frequency a filter type doesn't use. So is any frequency the current
+        filter type doesn't use, that control stays at the extreme of its range
+        out of the way of the other.
         '''
 
-        self.ui.sbLowF.setValue(newFreq)
+        sUI = self.ui
+        loOn, hiOn = self.filterFEnables.get(sUI.cbFilterType.currentText(),
+                                             (True, True))
+        if (not loOn) or (newFreq < sUI.sbLowF.minimum()) or\
+                (newFreq >= sUI.sbHighF.maximum()):
+            return
+
+        if newFreq >= sUI.sbHighF.value():
+            sUI.sbHighF.setValue(newFreq + 1)
+
+        sUI.sbLowF.setValue(newFreq)
 
     def set_audio_filter_high_f(self, newFreq):
         '''
-        Set the audio filter high frequency to newFreq
+        Set the audio filter high frequency to newFreq. If it isn't above the
+        low frequency the low frequency is moved below it first, otherwise the
+        range of the high frequency control would limit it. A frequency
+        outside the range of the controls is ignored, e.g. the -1 used for the
+        frequency a filter type doesn't use. So is any frequency the current
+        filter type doesn't use, that control stays at the extreme of its range
+        out of the way of the other.
         '''
 
-        self.ui.sbHighF.setValue(newFreq)
+        sUI = self.ui
+        loOn, hiOn = self.filterFEnables.get(sUI.cbFilterType.currentText(),
+                                             (True, True))
+        if (not hiOn) or (newFreq <= sUI.sbLowF.minimum()) or\
+                (newFreq > sUI.sbHighF.maximum()):
+            return
+
+        if newFreq <= sUI.sbLowF.value():
+            sUI.sbLowF.setValue(newFreq - 1)
+
+        sUI.sbHighF.setValue(newFreq)
 
     def set_audio_filter_order(self, newOrder):
         '''
@@ -547,42 +626,33 @@ class dlgSettings(QDialog):
     def audio_filter_low_f_changed(self, newFreq):
         '''
         The audio filter low frequency changed, keep the high frequency above it
+        by making it the minimum of the high frequency control. The control
+        clamps its own value, it only signals if it has to change.
         Parameters
         ----------
             newFreq: New low frequency selection
         '''
 
-        if self.fixingF is False:
-            if self.ui.sbHighF.value() <= newFreq:
-                # Prevent recursive calling and make the change
-                self.fixingF = True
-                self.ui.sbHighF.setValue(newFreq + 1)
-        else:
-            self.fixingF = False
+        self.ui.sbHighF.setMinimum(newFreq + 1)
 
     def audio_filter_high_f_changed(self, newFreq):
         '''
-        The audio filter high frequency changed, keep the high frequency below
-        it
+        The audio filter high frequency changed, keep the low frequency below
+        it by making it the maximum of the low frequency control. The control
+        clamps its own value, it only signals if it has to change.
         Parameters
         ----------
-            newFreq: New low frequency selection
+            newFreq: New high frequency selection
         '''
 
-        if self.fixingF is False:
-            if self.ui.sbLowF.value() >= newFreq:
-                # Prevent recursive calling
-                self.fixingF = True
-                self.ui.sbHighF.setValue(newFreq - 1)
-        else:
-            self.fixingF = False
+        self.ui.sbLowF.setMaximum(newFreq - 1)
 
     @property
     def audio_windowing_enabled(self):
         return self.ui.gbWindowing.isChecked()
 
     def window_function_exists(self, fnName):
-        return (self.ui.cbWindowFn.findText(fnName) != -1)
+        return (fnName in self.windowFnIndexes)
 
     @property
     def window_function_type(self):
@@ -602,7 +672,7 @@ class dlgSettings(QDialog):
             newType: String name of the new window function to select
         '''
 
-        newIndex = self.ui.cbWindowFn.findText(newType)
+        newIndex = self.windowFnIndexes.get(newType, -1)
         if newIndex != -1:
             self.ui.cbWindowFn.setCurrentIndex(newIndex)
 
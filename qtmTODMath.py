@@ -40,11 +40,359 @@
 import time
 import datetime
 
-from math import sin, cos, tan, asin, acos, atan2, degrees, radians
-#   atan, pi
+from functools import lru_cache
+from math import sin, cos, tan, asin, acos, atan2, pi
+#   atan, degrees, radians
+
+import numpy as np
 
 from PySide6.QtCore import (QLoggingCategory, qCDebug)
 
+
+# The NOAA spreadsheet counts days from 1899/12/30, also as a date ordinal so
+# that a date ordinal's offset from it is one subtraction
+_NOAA_EPOCH = datetime.date(1899, 12, 30)
+_NOAA_EPOCH_ORDINAL = _NOAA_EPOCH.toordinal()
+
+# Angle conversion factors, multiplying by them gives the same result as
+# radians() and degrees() without a function call for each conversion
+_DEG_TO_RAD = pi / 180.0
+_RAD_TO_DEG = 180.0 / pi
+
+# The constant angles in the formulas, already in radians. The zenith of the
+# sun at sunrise/sunset (90.833 degrees) is only used by its cosine. The
+# longitude of the moon's ascending node, used to correct for nutation, is
+# 125.04 - 1934.136 * Julian century degrees
+_COS_SUNRISE_ZENITH = cos(90.833 * _DEG_TO_RAD)
+_NODE_LONG_RAD = 125.04 * _DEG_TO_RAD
+_NODE_RATE_RAD = 1934.136 * _DEG_TO_RAD
+
+# The mean obliquity of the ecliptic is 23 degrees, 26 minutes and a cubic in
+# the Julian century of seconds. Folded into one cubic in degrees so that it
+# is evaluated without the two divisions to minutes and degrees
+_OBLIQ_C0 = 23 + 26 / 60 + 21.448 / 3600
+_OBLIQ_C1 = -46.815 / 3600
+_OBLIQ_C2 = -0.00059 / 3600
+_OBLIQ_C3 = 0.001813 / 3600
+
+# The sun's hour angle moves a degree every 4 minutes, this converts degrees of
+# hour angle to a fraction of the 1440 minute day
+_HA_DEG_TO_DAY = 4 / 1440
+
+
+# The NOAA method is a chain of formulas that, other than the sunrise hour angle
+# and solar noon, depend only on the Julian century of the date and time. One
+# "is it daytime" question walks the whole chain for sunrise and again for
+# sunset and each step asks for the steps it depends on again. So the Julian
+# century and the most re-used steps are cached on hashable arguments, repeat
+# requests for the same date and time are then a dictionary lookup.
+
+@lru_cache(maxsize=256)
+def _julian_day(dateOrdinal, daySeconds, homeTZ):
+    '''
+    Return the Julian day for a date ordinal, a second of the day and a
+    timezone offset in hours, see qtmTODMath.julian_day()
+    '''
+
+    jDay = dateOrdinal - _NOAA_EPOCH_ORDINAL + 2415018.5 +\
+        daySeconds / 86400.0 - homeTZ / 24.0
+    # =D2+2415018.5+E2-$B$5/24
+
+    return jDay
+
+
+@lru_cache(maxsize=256)
+def _julian_century(dateOrdinal, daySeconds, homeTZ):
+    '''
+    Return the Julian century for a date ordinal, a second of the day and a
+    timezone offset in hours, see qtmTODMath.julian_century()
+    '''
+
+    jCent = _julian_day(dateOrdinal, daySeconds, homeTZ) - 2451545.0
+    jCent /= 36525.0
+    # =(F2-2451545)/36525
+
+    return jCent
+
+
+def _sun_geom_mean_long(jCent):
+    '''
+    Return the sun's mean longitude in degrees at a Julian century
+    '''
+
+    # =MOD(280.46646+G2*(36000.76983+G2*0.0003032),360)
+    return (280.46646 + jCent * (36000.76983 + jCent * 0.0003032)) % 360
+
+
+@lru_cache(maxsize=256)
+def _sun_geom_mean_anom(jCent):
+    '''
+    Return the sun's mean anomaly in degrees at a Julian century
+    '''
+
+    # =357.52911+G2*(35999.05029-0.0001537*G2)
+    return 357.52911 + jCent * (35999.05029 - 0.0001537 * jCent)
+
+
+def _earth_orbit_eccent(jCent):
+    '''
+    Return the eccentricity of Earth's orbit at a Julian century
+    '''
+
+    # =0.016708634-G2*(0.000042037+0.0000001267*G2)
+    return 0.016708634 - jCent * (0.000042037 + 0.0000001267*jCent)
+
+
+@lru_cache(maxsize=256)
+def _sun_eq_of_ctr(jCent):
+    '''
+    Return the sun's equation of center in degrees at a Julian century
+    '''
+
+    # The three harmonics of the mean anomaly come from one sin() and one
+    # cos() of it, sin(2m) = 2 sin(m) cos(m) and
+    # sin(3m) = sin(m) (3 - 4 sin(m)^2)
+    mAnomRad = _sun_geom_mean_anom(jCent) * _DEG_TO_RAD
+    sinAnom = sin(mAnomRad)
+    cosAnom = cos(mAnomRad)
+    sEqC = sinAnom * (1.914602 - jCent * (0.004817 + 0.000014 * jCent))
+    sEqC += 2 * sinAnom * cosAnom * (0.019993 - 0.000101 * jCent)
+    sEqC += sinAnom * (3 - 4 * sinAnom * sinAnom) * 0.000289
+    # =SIN(RADIANS(J2))*(1.914602-G2*(0.004817+0.000014*G2))+SIN(RADIANS(2*J2))*(0.019993-0.000101*G2)+SIN(RADIANS(3*J2))*0.000289
+
+    return sEqC
+
+
+def _sun_true_long(jCent):
+    '''
+    Return the sun's true longitude in degrees at a Julian century
+    '''
+
+    # =I2+L2
+    return _sun_geom_mean_long(jCent) + _sun_eq_of_ctr(jCent)
+
+
+def _sun_true_anom(jCent):
+    '''
+    Return the sun's true anomaly in degrees at a Julian century
+    '''
+
+    # =J2+L2
+    return _sun_geom_mean_anom(jCent) + _sun_eq_of_ctr(jCent)
+
+
+@lru_cache(maxsize=256)
+def _sun_app_long_degrees(jCent):
+    '''
+    Return the sun's apparent longitude in degrees at a Julian century
+    '''
+
+    tLong = _sun_true_long(jCent)
+    aLong = tLong - 0.00569 - 0.00478 *\
+        sin(_NODE_LONG_RAD - _NODE_RATE_RAD * jCent)
+    # =M2-0.00569-0.00478*SIN(RADIANS(125.04-1934.136*G2))
+
+    return aLong
+
+
+def _mean_obliq_ecliptic(jCent):
+    '''
+    Return the mean obliquity of the ecliptic in degrees at a Julian century
+    '''
+
+    mObEcclip = _OBLIQ_C0 + jCent * (_OBLIQ_C1 + jCent * (_OBLIQ_C2 +
+                                                         jCent * _OBLIQ_C3))
+    # =23+(26+((21.448-G2*(46.815+G2*(0.00059-G2*0.001813))))/60)/60
+
+    return mObEcclip
+
+
+@lru_cache(maxsize=256)
+def _obliq_corr_degrees(jCent):
+    '''
+    Return the obliquity correction in degrees at a Julian century
+    '''
+
+    mObEcclip = _mean_obliq_ecliptic(jCent)
+    oCorr = mObEcclip + 0.00256 * cos(_NODE_LONG_RAD - _NODE_RATE_RAD * jCent)
+    # =Q2+0.00256*COS(RADIANS(125.04-1934.136*G2))
+
+    return oCorr
+
+
+@lru_cache(maxsize=256)
+def _sun_declination(jCent):
+    '''
+    Return the sun's declination in degrees at a Julian century
+    '''
+
+    aLong = _sun_app_long_degrees(jCent)
+    oCorr = _obliq_corr_degrees(jCent)
+    sDec = asin(sin(oCorr * _DEG_TO_RAD) * sin(aLong * _DEG_TO_RAD))
+    sDec *= _RAD_TO_DEG
+    # =DEGREES(ASIN(SIN(RADIANS(R2))*SIN(RADIANS(P2))))
+
+    return sDec
+
+
+def _sun_variance(jCent):
+    '''
+    Return the sun's variance ("var y") at a Julian century
+    '''
+
+    sVar = tan(_obliq_corr_degrees(jCent) * _DEG_TO_RAD / 2)
+    sVar *= sVar
+    # =TAN(RADIANS(R2/2))*TAN(RADIANS(R2/2))
+
+    return sVar
+
+
+@lru_cache(maxsize=256)
+def _eq_of_time(jCent):
+    '''
+    Return the equation of time in minutes at a Julian century
+    '''
+
+    # The mean longitude only appears doubled (or quadrupled) and the sine of
+    # the mean anomaly twice, both are found once
+    twoLongRad = 2 * _sun_geom_mean_long(jCent) * _DEG_TO_RAD
+    mAnomRad = _sun_geom_mean_anom(jCent) * _DEG_TO_RAD
+    sinAnom = sin(mAnomRad)
+    oEccent = _earth_orbit_eccent(jCent)
+    sVary = _sun_variance(jCent)
+    eTime = 4 * _RAD_TO_DEG * (sVary * sin(twoLongRad) - 2 * oEccent *
+                               sinAnom + 4 * oEccent * sVary *
+                               sinAnom * cos(twoLongRad) -
+                               0.5 * sVary * sVary * sin(2 * twoLongRad) -
+                               1.25 * oEccent * oEccent * sin(2 * mAnomRad))
+    # =4*DEGREES(U2*SIN(2*RADIANS(I2))-2*K2*SIN(RADIANS(J2))+4*K2*U2*SIN(RADIANS(J2))*COS(2*RADIANS(I2))-0.5*U2*U2*SIN(4*RADIANS(I2))-1.25*K2*K2*SIN(2*RADIANS(J2)))
+
+    return eTime
+
+
+@lru_cache(maxsize=4)
+def _home_lat_cos_tan(homeLat):
+    '''
+    Return the cosine and tangent of a home latitude in degrees. The home
+    latitude only changes when the user edits it, so they're cached on it
+    rather than recomputed for every hour angle of sunrise
+    '''
+
+    homeLatRad = homeLat * _DEG_TO_RAD
+
+    return cos(homeLatRad), tan(homeLatRad)
+
+
+@lru_cache(maxsize=256)
+def _HA_sunrise(jCent, homeLat):
+    '''
+    Return the hour angle of sunrise in degrees at a Julian century for a home
+    latitude in degrees
+    '''
+
+    sDecRad = _sun_declination(jCent) * _DEG_TO_RAD
+    cosHomeLat, tanHomeLat = _home_lat_cos_tan(homeLat)
+    haRiseIn = acos(_COS_SUNRISE_ZENITH / (cosHomeLat * cos(sDecRad)) -
+                    tanHomeLat * tan(sDecRad))
+    haRise = haRiseIn * _RAD_TO_DEG
+    # =DEGREES(ACOS(COS(RADIANS(90.833))/(COS(RADIANS($B$3))*COS(RADIANS(T2)))-TAN(RADIANS($B$3))*TAN(RADIANS(T2))))
+
+    return haRise
+
+
+def _solar_noon(eTime, homeLong, homeTZ):
+    '''
+    Return solar noon as a fraction of the day for an equation of time in
+    minutes at a home longitude in degrees and timezone offset in hours
+    '''
+
+    sNoon = (720 - 4 * homeLong - eTime + homeTZ * 60) / 1440
+    # =(720-4*$B$4-V2+$B$5*60)/1440
+
+    return sNoon
+
+
+def _solar_core(jCent, homeLat, homeLong, homeTZ):
+    '''
+    Evaluate the NOAA chain from the Julian century to local sunrise and sunset
+    in one pass for a home latitude, longitude and timezone. jCent may be a
+    single Julian century or an array of them, e.g. for many dates, the results
+    are then arrays of the same shape.
+
+    Returns a tuple of the local sunrise and sunset fractions of the day, the
+    sun's declination in degrees, the equation of time in minutes and solar
+    noon as a fraction of the day. Where the sun doesn't rise or set (polar
+    day or night) the sunrise and sunset are NaN rather than raising as the
+    scalar math in the class does.
+    '''
+
+    jCent = np.asarray(jCent, dtype=np.float64)
+
+    # Mean longitude and anomaly of the sun and eccentricity of Earth's orbit
+    mLong = (280.46646 + jCent * (36000.76983 + jCent * 0.0003032)) % 360
+    mAnom = 357.52911 + jCent * (35999.05029 - 0.0001537 * jCent)
+    oEccent = 0.016708634 - jCent * (0.000042037 + 0.0000001267*jCent)
+    mAnomRad = np.radians(mAnom)
+
+    # Equation of center, then the apparent longitude from the true longitude
+    sEqC = np.sin(mAnomRad) * (1.914602 -
+                               jCent * (0.004817 + 0.000014 * jCent))
+    sEqC += np.sin(2 * mAnomRad) * (0.019993 - 0.000101 * jCent)
+    sEqC += np.sin(3 * mAnomRad) * 0.000289
+    omegaRad = np.radians(125.04 - 1934.136 * jCent)
+    aLong = mLong + sEqC - 0.00569 - 0.00478 * np.sin(omegaRad)
+
+    # Obliquity of the ecliptic, corrected, gives the declination
+    mObEcclip = _OBLIQ_C0 + jCent * (_OBLIQ_C1 + jCent * (_OBLIQ_C2 +
+                                                         jCent * _OBLIQ_C3))
+    oCorr = mObEcclip + 0.00256 * np.cos(omegaRad)
+    sDecRad = np.arcsin(np.sin(np.radians(oCorr)) *
+                        np.sin(np.radians(aLong)))
+
+    # Equation of time in minutes
+    sVary = np.tan(np.radians(oCorr / 2)) ** 2
+    mLongRad = np.radians(mLong)
+    eTime = 4 * np.degrees(sVary * np.sin(2 * mLongRad) - 2 * oEccent *
+                           np.sin(mAnomRad) + 4 * oEccent * sVary *
+                           np.sin(mAnomRad) * np.cos(2 * mLongRad) -
+                           0.5 * sVary * sVary * np.sin(4 * mLongRad) -
+                           1.25 * oEccent * oEccent * np.sin(2 * mAnomRad))
+
+    # Hour angle of sunrise at the home latitude and solar noon at the home
+    # longitude and timezone, sunrise and sunset are either side of noon
+    cosHomeLat, tanHomeLat = _home_lat_cos_tan(homeLat)
+    with np.errstate(invalid="ignore"):
+        haRise = np.degrees(np.arccos(_COS_SUNRISE_ZENITH /
+                                      (cosHomeLat * np.cos(sDecRad)) -
+                                      tanHomeLat * np.tan(sDecRad)))
+    sNoon = _solar_noon(eTime, homeLong, homeTZ)
+    absNoon = np.abs(sNoon)
+    haRise = np.abs(haRise) * _HA_DEG_TO_DAY
+
+    return (absNoon - haRise, absNoon + haRise, np.degrees(sDecRad), eTime,
+            sNoon)
+
+
+@lru_cache(maxsize=8)
+def _angle_DMS(angle):
+    '''
+    Return the whole degrees, minutes and seconds in an angle in degrees. The
+    angle is rounded to a whole second first, an angle entered as e.g. 55.8
+    degrees is stored a hair under it and truncating each part would give
+    55 degrees 47 minutes 59 seconds. A negative angle gives all three parts
+    negative. Cached on the angle as the UI asks for each part of the same
+    latitude or longitude in turn.
+    '''
+
+    arcSeconds = int(round(abs(angle) * 3600.0))
+    degrees, arcSeconds = divmod(arcSeconds, 3600)
+    minutes, seconds = divmod(arcSeconds, 60)
+    if angle < 0:
+        return -degrees, -minutes, -seconds
+
+    return degrees, minutes, seconds
+
+
 class qtmTODMath:
     '''
     qtmTODMath class, a generic worldwide Time-Of-Day information calculator
@@ -72,20 +420,91 @@ class qtmTODMath:
     # HomeLong = -101.766673
     # HomeLat = 55.8
     # HomeLong = -4.5
-    Today = datetime.date.today()
-    systemTime = time.localtime()
-    HomeTZ = ((1.0 * systemTime.tm_gmtoff) / 3600.0)
-    # HomeTZ = 0.0
+    # The system time when set_system_time() was last used, None until then
+    systemTime = None
+    # The home timezone in hours or None to follow the system timezone, see
+    # HomeTZ
+    homeTZHours = None
+    # homeTZHours = 0.0
 
     CorrectForSysTZ = False
 
+    # The system timezone offset in seconds and the quarter hour (since the
+    # epoch) it was read from the system in, see __system_gmtoff()
+    sysGMTOffset = 0
+    sysGMTOffsetQuarter = None
+
+    # Today's date and the second (since the epoch) it was found in, see today
+    todayDate = None
+    todayTick = None
+
     logCategory = QLoggingCategory("QtMeter.Math.TOD")
 
     def __init__(self):
         '''
-        Constructor, no current functionality
+        Constructor, sets up the per-second cache of answers about the time now
+        '''
+
+        # Answers about today's daytime are asked for by the UI more often than
+        # they can change, by member function name they're kept with the
+        # second (and location/timezone settings) they were found at. See
+        # __tick_cached()
+        self.tickCache = {}
+
+    @property
+    def today(self):
+        '''
+        Today's date. Many member functions want it and the UI asks them
+        often, the date is only found again from the system once a second
         '''
-        pass
+
+        tick = int(time.time())
+        if tick != self.todayTick:
+            self.todayDate = datetime.date.today()
+            self.todayTick = tick
+
+        return self.todayDate
+
+    @property
+    def HomeTZ(self):
+        '''
+        The home timezone offset in hours. Until one is set it is the system
+        timezone offset now, so a daylight saving change while running is
+        followed rather than the offset at the time the module was loaded
+        '''
+
+        if self.homeTZHours is None:
+            return self.__system_gmtoff(time.time()) / 3600.0
+
+        return self.homeTZHours
+
+    @HomeTZ.setter
+    def HomeTZ(self, tzHours):
+        self.homeTZHours = tzHours
+
+    def __tick_cached(self, name, answerFn):
+        '''
+        Return the answer from a member function for the current second. If it
+        was already found during this second, with the same location and
+        timezone settings, the answer from then is returned without calling it
+
+        Parameters
+        ----------
+            name: string
+                The name of the member function the answer is cached under
+            answerFn: the member function to find the answer with if needed
+        '''
+
+        tickKey = (int(time.time()), self.HomeLat, self.HomeLong, self.HomeTZ,
+                   self.CorrectForSysTZ)
+        cached = self.tickCache.get(name)
+        if (cached is not None) and (cached[0] == tickKey):
+            return cached[1]
+
+        answer = answerFn()
+        self.tickCache[name] = (tickKey, answer)
+
+        return answer
 
     def get_time_now(self):
         '''
@@ -106,12 +525,12 @@ class qtmTODMath:
         Returns a daytime type (h:m:s)
         '''
 
-        timeNow = self.get_time_now()
-        correctHour = timeNow.hour
+        # One read of the system time provides the time and the system
+        # timezone offset in effect at that time
+        systemTime = time.localtime()
+        correctHour = systemTime.tm_hour
         if self.CorrectForSysTZ is True:
-            systemTime = time.localtime()
-            sysTZ = 1.0 * systemTime.tm_gmtoff
-            sysTZ /= 3600.0
+            sysTZ = systemTime.tm_gmtoff / 3600.0
             usingTZ = self.get_home_TZ()
 
             correction = int(sysTZ - usingTZ)
@@ -122,21 +541,18 @@ class qtmTODMath:
             # debug_message("TZ: Clock {}, Home {}".format(sysTZ, usingTZ))
             # debug_message("Time {} correction {}".format(correctHour, correction))
 
-            correctHour += correction
-            while correctHour < 0:
-                correctHour += 24
-            while correctHour > 23:
-                correctHour -= 24
+            # Wrap the corrected hour into the 0...23 range of a day
+            correctHour = (correctHour + correction) % 24
 
-        # debug_message("CT: {}:{}:{}".format(correctHour, timeNow.minute,
-        #                                    timeNow.second))
+        # debug_message("CT: {}:{}:{}".format(correctHour, systemTime.tm_min,
+        #                                    systemTime.tm_sec))
 
         correctedTime = datetime.time(correctHour,
-                                      timeNow.minute,
-                                      timeNow.second)
+                                      systemTime.tm_min,
+                                      systemTime.tm_sec)
         # msg = "UsingTZ: {}, SysTZ: {}, ".format(usingTZ, sysTZ)
         # msg += "Correction: {}, ".format(correction)
-        # msg += "Hour: {} => {}".format(timeNow.hour, correctHour)
+        # msg += "Hour: {} => {}".format(systemTime.tm_hour, correctHour)
         # debug_message(msg)
 
         return correctedTime
@@ -148,15 +564,37 @@ class qtmTODMath:
         Returns a float in the range zero to one inclusive
         '''
 
-        timeNow = self.get_time_now_with_correction()
-        y = timeNow.hour * 3600.0
-        y += timeNow.minute * 60.0
-        y += timeNow.second
+        # Straight from the seconds since the epoch to the whole second of the
+        # local day, the same second get_time_now_with_correction() has, but
+        # without building a struct_time and a datetime.time to pull apart
+        epochNow = time.time()
+        y = int(epochNow + self.__system_gmtoff(epochNow)) % 86400
+        if self.CorrectForSysTZ is True:
+            sysTZ = self.__system_gmtoff(epochNow) / 3600.0
+            correction = int(sysTZ - self.get_home_TZ())
+            y = (y + correction * 3600) % 86400
 
         # debug_message("Seconds used in day: {}".format(y))
 
         return (y / 86400.0)
 
+    def __system_gmtoff(self, epochNow):
+        '''
+        Get the system timezone offset at a time in seconds since the epoch.
+        The offset only changes at daylight saving transitions, which are on a
+        quarter hour, so it's only read from the system again when the quarter
+        hour of the time changes
+
+        Returns the system timezone offset in seconds
+        '''
+
+        quarterHour = int(epochNow // 900)
+        if quarterHour != self.sysGMTOffsetQuarter:
+            self.sysGMTOffset = time.localtime(epochNow).tm_gmtoff
+            self.sysGMTOffsetQuarter = quarterHour
+
+        return self.sysGMTOffset
+
     def daytime_fraction_of_day(self):
         '''
         Get the fraction of a standard 24 hour that is daytime today
@@ -164,15 +602,14 @@ class qtmTODMath:
         Returns a float with value greater than zero and less than one
 
         NB: Returns the fraction of today that is daytime. If the value is
-        required for another date, see the assignment to Today within this
+        required for another date, see the use of self.today within this
         function and consider permitting the caller to supply a replacement.
         '''
 
-        Today = datetime.date.today()
+        Today = self.today
         aTime = datetime.time(0, 6, 0)
 
-        r = self.local_sunrise(Today, aTime)
-        s = self.local_sunset(Today, aTime)
+        r, s = self.local_sunrise_sunset(Today, aTime)
 
         return (s - r)
 
@@ -205,7 +642,7 @@ class qtmTODMath:
         Returns a float in the range zero to one inclusive
         '''
 
-        Today = datetime.date.today()
+        Today = self.today
         aTime = datetime.time(0, 6, 0)
 
         # debug_message("Local sunrise: {}".format(self.local_sunrise(Today, aTime)))
@@ -219,6 +656,13 @@ class qtmTODMath:
         Returns a datetime object (h:m:s)
         '''
 
+        return self.__tick_cached("get_sunrise_time", self.__get_sunrise_time)
+
+    def __get_sunrise_time(self):
+        '''
+        Uncached get_sunrise_time(), see __tick_cached()
+        '''
+
         x = self.get_sunrise_fraction_of_day()
 
         # debug_message("Sunrise fraction: {}".format(x))
@@ -245,7 +689,7 @@ class qtmTODMath:
         Returns a float in the range zero to one inclusive
         '''
 
-        Today = datetime.date.today()
+        Today = self.today
         aTime = datetime.time(0, 6, 0)
 
         # debug_message("Sunset fraction has local sunset: {}".format(self.local_sunset(Today, aTime)))
@@ -259,11 +703,18 @@ class qtmTODMath:
         Returns a datetime object (h:m:s)
         '''
 
+        return self.__tick_cached("get_sunset_time", self.__get_sunset_time)
+
+    def __get_sunset_time(self):
+        '''
+        Uncached get_sunset_time(), see __tick_cached()
+        '''
+
         x = self.get_sunset_fraction_of_day()
 
         # debug_message("Sunset fraction: {}".format(x))
 
-        return self.timeFromDayFraction(x)
+        return self.time_from_day_fraction(x)
 
     def get_sunset_delta(self):
         '''
@@ -303,6 +754,13 @@ class qtmTODMath:
         midnight today, else returns False
         '''
 
+        return self.__tick_cached("its_after_sunset_today", self.__its_after_sunset_today)
+
+    def __its_after_sunset_today(self):
+        '''
+        Uncached its_after_sunset_today(), see __tick_cached()
+        '''
+
         ssDelta = self.get_sunset_fraction_of_day()
         nowDelta = self.get_time_now_fraction_of_day()
         if nowDelta > ssDelta:
@@ -318,9 +776,18 @@ class qtmTODMath:
         else returns False
         '''
 
-        srDelta = self.get_sunrise_delta()
-        ssDelta = self.get_sunset_delta()
-        nowDelta = self.get_time_now_delta_with_correction()
+        return self.__tick_cached("its_daytime", self.__its_daytime)
+
+    def __its_daytime(self):
+        '''
+        Uncached its_daytime(), see __tick_cached()
+        '''
+
+        # Compare as fractions of the day, they're what sunrise, sunset and the
+        # time now are found as, without converting each to a timedelta
+        srDelta = self.get_sunrise_fraction_of_day()
+        ssDelta = self.get_sunset_fraction_of_day()
+        nowDelta = self.get_time_now_fraction_of_day()
 
         # debug_message("Time Deltas:")
         # debug_message("\\_ Sunrise: {}".format(srDelta))
@@ -356,15 +823,17 @@ class qtmTODMath:
         # debug_message("\\_ Sunrise: {}".format(srDelta))
         # debug_message("\\_  Sunset: {}".format(ssDelta))
         # debug_message("\\_     now: {}".format(nowDelta))
-        if self.its_daytime():
+        # Same test as its_daytime() but on the times already found
+        if (nowDelta >= srDelta) and (nowDelta < ssDelta):
             # debug_message("Compute fraction of DAY")
             # Subtract sunrise from now, all as a fraction of ratio of daytime
             elapsedFraction = nowDelta - srDelta
-            elapsedFraction /= self.daytimeFractionOfDay()
+            # As a fraction of daytime, what daytime_fraction_of_day() returns
+            elapsedFraction /= ssDelta - srDelta
         else:
             # debug_message("Compute fraction of NIGHT")
             # Night crosses midnight, take care
-            if self.its_after_sunset_today():
+            if nowDelta > ssDelta:
                 # debug_message("\\_ MORNING")
                 # Evening, subtract sunset
                 elapsedFraction = nowDelta - ssDelta
@@ -373,8 +842,9 @@ class qtmTODMath:
                 # Morning, Add whole evening to current part of morning
                 elapsedFraction = 1.0 - ssDelta + nowDelta
 
-            # As a fraction of nighttime
-            elapsedFraction /= self.nighttime_fraction_of_day()
+            # As a fraction of nighttime, what nighttime_fraction_of_day()
+            # returns
+            elapsedFraction /= 1.0 - (ssDelta - srDelta)
 
         # msg = "time now as a fraction of "
         # msg += "current light period: {}".format(elapsedFraction)
@@ -384,21 +854,19 @@ class qtmTODMath:
 
     def ref_days(self, aDate):
         '''
-        Get the number of days between a supplied date and today, always returns
-        the mathematical absolute (positive) number of days between the two
-        regardless of which date is earlier.
+        Get the number of days between 1899/12/30, the day the NOAA method
+        counts from, and a supplied date. Dates before then are negative, the
+        method isn't meant for them.
 
         Parameters
         ----------
             aDate: a datetime object
-                Initialized by caller to a date to find the number of days away
-                from today it is
+                Initialized by caller to a date to find the number of days
+                since 1899/12/30 for
         '''
 
         # baseDate = datetime.date(1900, 1, 14)
-        baseDate = datetime.date(1899, 12, 30)
-        deltaDate = abs(aDate - baseDate)
-        return deltaDate.days
+        return (aDate - _NOAA_EPOCH).days
     # ref_days
 
     def frac_of_local_day(self, aTime):
@@ -417,7 +885,7 @@ class qtmTODMath:
         # Get second of the day from the time
         fDay = aTime.hour * 3600.0
         fDay += aTime.minute * 60.0
-        fDay += aTime.second * 1.0
+        fDay += aTime.second
 
         # Fraction of day is the second of the day divided by seconds in a day
         fDay /= 86400.0
@@ -451,13 +919,10 @@ class qtmTODMath:
             print("Bad fraction of day: {}, using midnight".format(fracOfDay))
             fracOfDay = 0.0
 
-        # Convert to second of the day
-        fracOfDay *= 86400.0
-
-        # Get the h:m:s
-        h = int(fracOfDay / 3600.0)
-        m = int((fracOfDay - (3600.0 * h)) / 60.0)
-        s = int(fracOfDay) % 60
+        # Convert to whole second of the day and get the h:m:s from it
+        daySeconds = int(fracOfDay * 86400.0)
+        h, s = divmod(daySeconds, 3600)
+        m, s = divmod(s, 60)
         t = datetime.time(h, m, s)
 
         return t
@@ -483,11 +948,11 @@ class qtmTODMath:
             A floating point Julian day for the supplied local date(/time)
         '''
 
-        jDay = self.ref_days(aDate) + 2415018.5 +\
-                self.frac_of_local_day(aTime) - self.HomeTZ / 24.0
-        # =D2+2415018.5+E2-$B$5/24
+        # The fraction of the day is frac_of_local_day() in line, the second
+        # of the day over the seconds in a day
+        daySeconds = aTime.hour * 3600 + aTime.minute * 60 + aTime.second
 
-        return jDay
+        return _julian_day(aDate.toordinal(), daySeconds, self.HomeTZ)
     # julian_day
 
     def julian_century(self, aDate, aTime=datetime.time(0, 0, 0)):
@@ -513,12 +978,11 @@ class qtmTODMath:
             elapsed at the supplied date(/time)
         '''
 
-        jCent = self.julian_day(aDate, aTime)
-        jCent -= 2451545.0
-        jCent /= 36525.0
-        # =(F2-2451545)/36525
+        # Seconds of the day, the same value frac_of_local_day() takes the
+        # fraction of the day from
+        daySeconds = aTime.hour * 3600 + aTime.minute * 60 + aTime.second
 
-        return jCent
+        return _julian_century(aDate.toordinal(), daySeconds, self.HomeTZ)
     # julian_century
 
     def sun_geom_mean_long(self, aDate, aTime=datetime.time(0, 0, 0)):
@@ -540,11 +1004,7 @@ class qtmTODMath:
             supplied date and time (or midnight)
         '''
 
-        jCent = self.julian_century(aDate, aTime)
-        mLong = (280.46646 + jCent * (36000.76983 + jCent * 0.0003032)) % 360
-        # =MOD(280.46646+G2*(36000.76983+G2*0.0003032),360)
-
-        return mLong
+        return _sun_geom_mean_long(self.julian_century(aDate, aTime))
     # sun_geom_mean_long
 
     def sun_geom_mean_anom(self, aDate, aTime=datetime.time(0, 0, 0)):
@@ -566,11 +1026,7 @@ class qtmTODMath:
             anomaly at the supplied date(/time)
         '''
 
-        jCent = self.julian_century(aDate, aTime)
-        mAnom = 357.52911 + jCent * (35999.05029 - 0.0001537 * jCent)
-        # =357.52911+G2*(35999.05029-0.0001537*G2)
-
-        return mAnom
+        return _sun_geom_mean_anom(self.julian_century(aDate, aTime))
     # sun_geom_mean_anom
 
     def sun_eq_of_ctr(self, aDate, aTime=datetime.time(0, 0, 0)):
@@ -592,15 +1048,7 @@ class qtmTODMath:
             the supplied date(/time)
         '''
 
-        jCent = self.julian_century(aDate, aTime)
-        mAnom = self.sun_geom_mean_anom(aDate, aTime)
-        sEqC = sin(radians(mAnom))
-        sEqC *= (1.914602 - jCent * (0.004817 + 0.000014 * jCent))
-        sEqC += sin(radians(2 * mAnom)) * (0.019993 - 0.000101 * jCent)
-        sEqC += sin(radians(3 * mAnom)) * 0.000289
-        # =SIN(RADIANS(J2))*(1.914602-G2*(0.004817+0.000014*G2))+SIN(RADIANS(2*J2))*(0.019993-0.000101*G2)+SIN(RADIANS(3*J2))*0.000289
-
-        return sEqC
+        return _sun_eq_of_ctr(self.julian_century(aDate, aTime))
     # sun_eq_of_ctr
 
     def sun_true_long(self, aDate, aTime=datetime.time(0, 0, 0)):
@@ -622,11 +1070,7 @@ class qtmTODMath:
             longitude at the supplied date(/time)
         '''
 
-        tLong = self.sun_geom_mean_long(aDate, aTime) +\
-                self.sun_eq_of_ctr(aDate, aTime)
-        # =I2+L2
-
-        return tLong
+        return _sun_true_long(self.julian_century(aDate, aTime))
     # sun_true_long
 
     def sun_true_anom(self, aDate, aTime=datetime.time(0, 0, 0)):
@@ -648,11 +1092,7 @@ class qtmTODMath:
             anomaly at the supplied date(/time)
         '''
 
-        tAnom = self.sun_geom_mean_anom(aDate, aTime) +\
-                self.sun_eq_of_ctr(aDate, aTime)
-        # =J2+L2
-
-        return tAnom
+        return _sun_true_anom(self.julian_century(aDate, aTime))
     # sun_true_anom
 
     def sun_rad_vector(self, aDate, aTime=datetime.time(0, 0, 0)):
@@ -678,7 +1118,7 @@ class qtmTODMath:
         oEccent = self.earth_orbit_eccent(aDate, aTime)
         tAnom = self.sun_true_anom(aDate, aTime)
         rVec = (1.000001018 * (1 - oEccent * oEccent))
-        rVec /= (1 + oEccent * cos(radians(tAnom)))
+        rVec /= (1 + oEccent * cos(tAnom * _DEG_TO_RAD))
         # =(1.000001018*(1-K2*K2))/(1+K2*COS(RADIANS(N2)))
 
         return rVec
@@ -703,13 +1143,7 @@ class qtmTODMath:
             longitude at the supplied date(/time)
         '''
 
-        jCent = self.julian_century(aDate, aTime)
-        tLong = self.sun_true_long(aDate, aTime)
-        aLong = tLong - 0.00569 - 0.00478 *\
-            sin(radians(125.04 - 1934.136 * jCent))
-        # =M2-0.00569-0.00478*SIN(RADIANS(125.04-1934.136*G2))
-
-        return aLong
+        return _sun_app_long_degrees(self.julian_century(aDate, aTime))
     # sun_app_long_degrees
 
     def sun_right_ascension(self, aDate, aTime=datetime.time(0, 0, 0)):
@@ -731,14 +1165,14 @@ class qtmTODMath:
             ascension at the supplied date(/time)
         '''
 
-        aLong = radians(self.sun_app_long_degrees(aDate, aTime))
-        oCorr = radians(self.obliq_corr_degrees(aDate, aTime))
+        aLong = self.sun_app_long_degrees(aDate, aTime) * _DEG_TO_RAD
+        oCorr = self.obliq_corr_degrees(aDate, aTime) * _DEG_TO_RAD
 
         x = cos(aLong)
         y = cos(oCorr) * sin(aLong)
 
         rAscRad = atan2(y, x)
-        rAscDeg = degrees(rAscRad)
+        rAscDeg = rAscRad * _RAD_TO_DEG
 
         # aLong = 84.61
         # oCorr = 23.44
@@ -774,12 +1208,7 @@ class qtmTODMath:
             at the supplied date(/time)
         '''
 
-        aLong = self.sun_app_long_degrees(aDate, aTime)
-        oCorr = self.obliq_corr_degrees(aDate, aTime)
-        sDec = degrees(asin(sin(radians(oCorr)) * sin(radians(aLong))))
-        # =DEGREES(ASIN(SIN(RADIANS(R2))*SIN(RADIANS(P2))))
-
-        return sDec
+        return _sun_declination(self.julian_century(aDate, aTime))
     # sun_declination
 
     def sun_variance(self, aDate, aTime=datetime.time(0, 0, 0)):
@@ -800,11 +1229,7 @@ class qtmTODMath:
             supplied date(/time)
         '''
 
-        oCorr = self.obliq_corr_degrees(aDate, aTime)
-        sVar = tan(radians(oCorr / 2)) * tan(radians(oCorr / 2))
-        # =TAN(RADIANS(R2/2))*TAN(RADIANS(R2/2))
-
-        return sVar
+        return _sun_variance(self.julian_century(aDate, aTime))
     # sun_variance
 
     def HA_sunrise(self, aDate, aTime=datetime.time(0, 0, 0)):
@@ -826,16 +1251,7 @@ class qtmTODMath:
             at the supplied date(/time)
         '''
 
-        sDecRad = radians(self.sun_declination(aDate, aTime))
-        homeLatRad = radians(self.HomeLat)
-        haRiseIn = acos(cos(radians(90.833)) / (cos(homeLatRad) *
-                        cos(sDecRad)) - tan(homeLatRad) *
-                        tan(sDecRad))
-        haRise = degrees(haRiseIn)
-        # haRise = degrees(acos(cos(radians(90.833)) / (cos(radians(self.HomeLat)) * cos(radians(self.sun_declination(aDate, aTime)))) - tan(radians(self.HomeLat)) * tan(radians(self.sun_declination(aDate, aTime)))))
-        # =DEGREES(ACOS(COS(RADIANS(90.833))/(COS(RADIANS($B$3))*COS(RADIANS(T2)))-TAN(RADIANS($B$3))*TAN(RADIANS(T2))))
-
-        return haRise
+        return _HA_sunrise(self.julian_century(aDate, aTime), self.HomeLat)
     # HA_sunrise
 
     def mean_obliq_ecliptic(self, aDate, aTime=datetime.time(0, 0, 0)):
@@ -858,12 +1274,7 @@ class qtmTODMath:
             at the supplied date(/time)
         '''
 
-        jCent = self.julian_century(aDate, aTime)
-        mObEcclip = 23 + (26 + ((21.448 - jCent * (46.815 + jCent * (0.00059 -
-                                jCent * 0.001813)))) / 60) / 60
-        # =23+(26+((21.448-G2*(46.815+G2*(0.00059-G2*0.001813))))/60)/60
-
-        return mObEcclip
+        return _mean_obliq_ecliptic(self.julian_century(aDate, aTime))
     # mean_obliq_ecliptic
 
     def obliq_corr_degrees(self, aDate, aTime=datetime.time(0, 0, 0)):
@@ -885,12 +1296,7 @@ class qtmTODMath:
             supplied date(/time)
         '''
 
-        jCent = self.julian_century(aDate, aTime)
-        mObEcclip = self.mean_obliq_ecliptic(aDate, aTime)
-        oCorr = mObEcclip + 0.00256 * cos(radians(125.04 - 1934.136 * jCent))
-        # =Q2+0.00256*COS(RADIANS(125.04-1934.136*G2))
-
-        return oCorr
+        return _obliq_corr_degrees(self.julian_century(aDate, aTime))
     # obliq_corr_degrees
 
     def earth_orbit_eccent(self, aDate, aTime=datetime.time(0, 0, 0)):
@@ -912,11 +1318,7 @@ class qtmTODMath:
             at the supplied date(/time)
         '''
 
-        jCent = self.julian_century(aDate, aTime)
-        oEccent = 0.016708634 - jCent * (0.000042037 + 0.0000001267*jCent)
-        # =0.016708634-G2*(0.000042037+0.0000001267*G2)
-
-        return oEccent
+        return _earth_orbit_eccent(self.julian_century(aDate, aTime))
     # earth_orbit_eccent
 
     # Eq of Time (minutes)
@@ -939,19 +1341,7 @@ class qtmTODMath:
             supplied date(/time)
         '''
 
-        mLong = self.sun_geom_mean_long(aDate, aTime)
-        mAnom = self.sun_geom_mean_anom(aDate, aTime)
-        oEccent = self.earth_orbit_eccent(aDate, aTime)
-        sVary = self.sun_variance(aDate, aTime)
-        # eTime = -1
-        eTime = 4 * degrees(sVary * sin(2 * radians(mLong)) - 2 * oEccent *
-                            sin(radians(mAnom)) + 4 * oEccent * sVary *
-                            sin(radians(mAnom)) * cos(2 * radians(mLong)) -
-                            0.5 * sVary * sVary * sin(4 * radians(mLong)) -
-                            1.25 * oEccent * oEccent * sin(2 * radians(mAnom)))
-        # =4*DEGREES(U2*SIN(2*RADIANS(I2))-2*K2*SIN(RADIANS(J2))+4*K2*U2*SIN(RADIANS(J2))*COS(2*RADIANS(I2))-0.5*U2*U2*SIN(4*RADIANS(I2))-1.25*K2*K2*SIN(2*RADIANS(J2)))
-
-        return eTime
+        return _eq_of_time(self.julian_century(aDate, aTime))
     # egOfTime
 
     def solar_noon(self, aDate, aTime=datetime.time(0, 0, 0)):
@@ -973,14 +1363,44 @@ class qtmTODMath:
             the supplied date(/time)
         '''
 
-        # rDays = ref_days(aDate)
-        eTime = self.eq_of_time(aDate, aTime)
-        sNoon = (720 - 4 * self.HomeLong - eTime + self.HomeTZ * 60) / 1440
-        # =(720-4*$B$4-V2+$B$5*60)/1440
+        sNoon, _, _, _, _ = self.__solar_times(aDate, aTime)
 
         return sNoon
     # solar_noon
 
+    def __solar_times(self, aDate, aTime):
+        '''
+        Get solar noon, the hour angle of sunrise, local sunrise, local sunset
+        and the sunlight duration at a given date and time together. They all
+        derive from the equation of time and the hour angle of sunrise at one
+        Julian century, which is only found once for all of them
+
+        Returns
+        -------
+            A tuple of solar noon, the hour angle of sunrise, local sunrise,
+            local sunset and sunlight duration, each as their own member
+            function returns them
+        '''
+
+        jCent = self.julian_century(aDate, aTime)
+        eTime = _eq_of_time(jCent)
+        haRise = _HA_sunrise(jCent, self.HomeLat)
+
+        sNoon = _solar_noon(eTime, self.HomeLong, self.HomeTZ)
+
+        hRise = abs(haRise) * _HA_DEG_TO_DAY
+        absNoon = abs(sNoon)
+        lRise = absNoon - hRise
+        # =X2-W2*4/1440
+        lSet = absNoon + hRise
+        # =X2+W2*4/1440
+
+        sDur = 8 * haRise
+        # =8*W2
+
+        return sNoon, haRise, lRise, lSet, sDur
+    # __solar_times
+
     def local_sunrise(self, aDate, aTime=datetime.time(0, 0, 0)):
         '''
         Get the fraction of the day when local sunrise occurs at a given date
@@ -1001,10 +1421,7 @@ class qtmTODMath:
             sunrise occurs at the supplied date(/time)
         '''
 
-        hRise = abs(self.HA_sunrise(aDate, aTime))
-        sNoon = abs(self.solar_noon(aDate, aTime))
-        lRise = sNoon - hRise * 4 / 1440
-        # =X2-W2*4/1440
+        lRise, _ = self.local_sunrise_sunset(aDate, aTime)
 
         return lRise
     # local_sunrise
@@ -1029,14 +1446,173 @@ class qtmTODMath:
             sunset occurs at the supplied date(/time)
         '''
 
-        hRise = abs(self.HA_sunrise(aDate, aTime))
-        sNoon = abs(self.solar_noon(aDate, aTime))
-        lSet = sNoon + hRise * 4 / 1440
-        # =X2+W2*4/1440
+        _, lSet = self.local_sunrise_sunset(aDate, aTime)
 
         return lSet
     # local_sunset
 
+    def local_sunrise_sunset(self, aDate, aTime=datetime.time(0, 0, 0)):
+        '''
+        Get the fractions of the day when local sunrise and sunset occur at a
+        given date (and time). They are either side of solar noon by the same
+        hour angle so are found together for callers that need both
+
+        Parameters
+        ----------
+            aDate: a date object (datetime.date)
+                The date to return the fractions of day at sunrise and sunset
+                for
+            aTime: Optional, a datetime object with the time initialized
+                   (otherwise zero hour, minute, second is assumed).
+                The time-of-day during the date to return the fractions of day
+                at sunrise and sunset for
+
+        Returns
+        -------
+            Returns a tuple of floating point numbers for the fractions of the
+            day when sunrise and sunset occur at the supplied date(/time)
+        '''
+
+        _, _, lRise, lSet, _ = self.__solar_times(aDate, aTime)
+
+        return lRise, lSet
+    # local_sunrise_sunset
+
+    def local_sun_events(self, aDate, aTime=datetime.time(0, 0, 0)):
+        '''
+        Get local sunrise, local sunset and sunlight duration at a given date
+        (and time) together, for callers that show more than one of them
+
+        Parameters
+        ----------
+            aDate: a date object (datetime.date)
+                The date to return the sun events for
+            aTime: Optional, a datetime object with the time initialized
+                   (otherwise zero hour, minute, second is assumed).
+                The time-of-day during the date to return the sun events for
+
+        Returns
+        -------
+            Returns a tuple of the fractions of the day when sunrise and
+            sunset occur and the sunlight duration, the same values as
+            local_sunrise(), local_sunset() and sunlight_duration() return
+        '''
+
+        _, _, lRise, lSet, sDur = self.__solar_times(aDate, aTime)
+
+        return lRise, lSet, sDur
+    # local_sun_events
+
+    def sunrise_sunset_fractions(self, dates, aTime=datetime.time(0, 0, 0)):
+        '''
+        Get the fractions of the day when local sunrise and sunset occur for
+        many dates at once, e.g. to plot them over a year, without evaluating
+        local_sunrise() and local_sunset() for each date
+
+        Parameters
+        ----------
+            dates: an iterable of date objects (datetime.date)
+                The dates to return the sunrise and sunset fractions for
+            aTime: Optional, a datetime object with the time initialized
+                   (otherwise zero hour, minute, second is assumed).
+                The time-of-day during each date to return the fractions for
+
+        Returns
+        -------
+            Returns a tuple of two numpy arrays of floating point fractions of
+            the day, sunrise and sunset for each supplied date. A date when the
+            sun doesn't rise or set at the home latitude has NaN for both
+        '''
+
+        lRise, lSet, _, _, _ = self.__solar_core_for_dates(dates, aTime)
+
+        return lRise, lSet
+    # sunrise_sunset_fractions
+
+    def local_sunrise_for_dates(self, dates, aTime=datetime.time(0, 0, 0)):
+        '''
+        Get the fractions of the day when local sunrise occurs for many dates
+        at once, see sunrise_sunset_fractions()
+
+        Returns
+        -------
+            Returns a numpy array of the fraction of the day at sunrise for
+            each supplied date, NaN where the sun doesn't rise
+        '''
+
+        lRise, _, _, _, _ = self.__solar_core_for_dates(dates, aTime)
+
+        return lRise
+    # local_sunrise_for_dates
+
+    def local_sunset_for_dates(self, dates, aTime=datetime.time(0, 0, 0)):
+        '''
+        Get the fractions of the day when local sunset occurs for many dates
+        at once, see sunrise_sunset_fractions()
+
+        Returns
+        -------
+            Returns a numpy array of the fraction of the day at sunset for each
+            supplied date, NaN where the sun doesn't set
+        '''
+
+        _, lSet, _, _, _ = self.__solar_core_for_dates(dates, aTime)
+
+        return lSet
+    # local_sunset_for_dates
+
+    def eq_of_time_for_dates(self, dates, aTime=datetime.time(0, 0, 0)):
+        '''
+        Get the sun equation of time for many dates at once, see
+        sunrise_sunset_fractions() for the parameters
+
+        Returns
+        -------
+            Returns a numpy array of the sun equation of time for each supplied
+            date, the same values as eq_of_time() for each
+        '''
+
+        _, _, _, eTime, _ = self.__solar_core_for_dates(dates, aTime)
+
+        return eTime
+    # eq_of_time_for_dates
+
+    def solar_noon_for_dates(self, dates, aTime=datetime.time(0, 0, 0)):
+        '''
+        Get the position of solar noon for many dates at once, see
+        sunrise_sunset_fractions() for the parameters
+
+        Returns
+        -------
+            Returns a numpy array of the position of solar noon for each
+            supplied date, the same values as solar_noon() for each
+        '''
+
+        _, _, _, _, sNoon = self.__solar_core_for_dates(dates, aTime)
+
+        return sNoon
+    # solar_noon_for_dates
+
+    def __solar_core_for_dates(self, dates, aTime):
+        '''
+        Evaluate _solar_core() for the Julian centuries of many dates at one
+        time-of-day. The Julian centuries are found as one array rather than
+        through julian_century() so that a batch of dates doesn't push the
+        dates in use out of its cache
+        '''
+
+        dateOrdinals = np.fromiter((aDate.toordinal() for aDate in dates),
+                                   dtype=np.float64)
+        daySeconds = aTime.hour * 3600 + aTime.minute * 60 + aTime.second
+        homeTZ = self.HomeTZ
+
+        jDay = dateOrdinals - _NOAA_EPOCH_ORDINAL + 2415018.5 +\
+            daySeconds / 86400.0 - homeTZ / 24.0
+        jCent = (jDay - 2451545.0) / 36525.0
+
+        return _solar_core(jCent, self.HomeLat, self.HomeLong, homeTZ)
+    # __solar_core_for_dates
+
     def sunlight_duration(self, aDate, aTime=datetime.time(0, 0, 0)):
         '''
         Get the duration of sunlight at a given date (and time)
@@ -1056,59 +1632,43 @@ class qtmTODMath:
             daylight at the supplied date(/time)
         '''
 
-        sDur = 8 * self.HA_sunrise(aDate, aTime)
-        # =8*W2
+        _, _, _, _, sDur = self.__solar_times(aDate, aTime)
 
         return sDur
     # sunlight_duration
 
-    def test_function(self, aTime):
+    def test_function(self, aTime, aDate=None):
         '''
         Test function that dumps the output of all members to the console for
-        a given date
+        a given time (and date)
 
         Parameters
         ----------
-            aDate: a date object
-                The date to use in member functions that accept a date argument
+            aTime: a datetime object with the time initialized
+                The time to use in member functions that accept a time argument
+            aDate: Optional, a date object
+                The date to use in member functions that accept a date
+                argument, today if not supplied
         '''
 
-        Today = datetime.date.today()
+        Today = aDate
+        if Today is None:
+            Today = self.today
         if self.doDBug is True:
-            x = self.julian_day(Today, aTime)
-            print("julian_day: {}".format(x))
-            x = self.julian_century(Today, aTime)
-            print("julian_century: {}".format(x))
-            x = self.sun_geom_mean_long(Today, aTime)
-            print("sun_geom_mean_long: {}".format(x))
-            x = self.sun_geom_mean_anom(Today, aTime)
-            print("sun_geom_mean_anom: {}".format(x))
-            x = self.earth_orbit_eccent(Today, aTime)
-            print("earth_orbit_eccent: {}".format(x))
-            x = self.sun_eq_of_ctr(Today, aTime)
-            print("sun_eq_of_ctr: {}".format(x))
-            x = self.sun_true_long(Today, aTime)
-            print("sun_true_long: {}".format(x))
-            x = self.sun_true_anom(Today, aTime)
-            print("sun_true_anom: {}".format(x))
-            x = self.sun_rad_vector(Today, aTime)
-            print("sun_rad_vector: {}".format(x))
-            x = self.sun_app_long_degrees(Today, aTime)
-            print("sun_app_long_degrees: {}".format(x))
-            x = self.mean_obliq_ecliptic(Today, aTime)
-            print("mean_obliq_ecliptic: {}".format(x))
-            x = self.obliq_corr_degrees(Today, aTime)
-            print("obliq_corr_degrees: {}".format(x))
-            x = self.sun_right_ascension(Today, aTime)
-            print("sun_right_ascension: {}".format(x))
-            x = self.sun_declination(Today, aTime)
-            print("sun_declination: {}".format(x))
-            x = self.sun_variance(Today, aTime)
-            print("sun_variance: {}".format(x))
-            x = self.eq_of_time(Today, aTime)
-            print("eq_of_time: {}".format(x))
-            x = self.HA_sunrise(Today, aTime)
-            print("HA_sunrise: {}".format(x))
+            # Collect the output and print it once at the end rather than
+            # writing to the console between each calculation
+            lines = []
+            for memberFn in (self.julian_day, self.julian_century,
+                             self.sun_geom_mean_long, self.sun_geom_mean_anom,
+                             self.earth_orbit_eccent, self.sun_eq_of_ctr,
+                             self.sun_true_long, self.sun_true_anom,
+                             self.sun_rad_vector, self.sun_app_long_degrees,
+                             self.mean_obliq_ecliptic, self.obliq_corr_degrees,
+                             self.sun_right_ascension, self.sun_declination,
+                             self.sun_variance, self.eq_of_time,
+                             self.HA_sunrise):
+                x = memberFn(Today, aTime)
+                lines.append("{}: {}".format(memberFn.__name__, x))
 
 #            sDecRad = radians(self.sun_declination(Today, aTime))
 #            homeLatRad = radians(self.get_latitude())
@@ -1117,33 +1677,25 @@ class qtmTODMath:
 #            print("\\_ Home latitude: {} radians".format(homeLatRad))
 #            print("\\_ Home longitude: {} radians".format(homeLongRad))
 
-            x = self.solar_noon(Today, aTime)
-            x *= 24 * 3600
-            h = int(x / 3600)
-            print("Hour: {}".format(h))
-            m = int((x - (3600 * h)) / 60)
-            s = int(x) % 60
-            t = datetime.time(h, m, s)
-            # t = datetime.time(0, 0, 0)
-            print("solar_noon: {} - {}:{}:{} - {}".format(x, h, m, s, t))
-            x = abs(self.local_sunrise(Today, aTime))
-            x *= 24 * 3600
-            h = int(x / 3600)
-            m = int((x - (3600 * h)) / 60)
-            s = int(x) % 60
-            t = datetime.time(h, m, s)
-            # t = datetime.time(0, 0, 0)
-            print("local_sunrise: {} - {}:{}:{} - {}".format(x, h, m, s, t))
-            x = abs(self.local_sunset(Today, aTime))
-            x *= 24 * 3600
-            h = int(x / 3600)
-            m = int((x - (3600 * h)) / 60)
-            s = int(x) % 60
-            t = datetime.time(h, m, s)
-            # t = datetime.time(0, 0, 0)
-            print("local_sunset: {} - {}:{}:{} - {}".format(x, h, m, s, t))
-            x = self.sunlight_duration(Today, aTime)
-            print("sunlight_duration: {}".format(x))
+            # Solar noon, sunrise, sunset and sunlight duration all come from
+            # one evaluation
+            sNoon, _, lRise, lSet, sDur = self.__solar_times(Today, aTime)
+            for name, x in (("solar_noon", sNoon),
+                            ("local_sunrise", abs(lRise)),
+                            ("local_sunset", abs(lSet))):
+                x *= 24 * 3600
+                h = int(x / 3600)
+                if name == "solar_noon":
+                    lines.append("Hour: {}".format(h))
+                m = int((x - (3600 * h)) / 60)
+                s = int(x) % 60
+                t = datetime.time(h, m, s)
+                # t = datetime.time(0, 0, 0)
+                lines.append("{}: {} - {}:{}:{} - {}".format(name, x, h, m, s,
+                                                             t))
+            lines.append("sunlight_duration: {}".format(sDur))
+
+            print("\n".join(lines))
     # test_function
 
     def get_angle_degrees(self, angle):
@@ -1159,7 +1711,9 @@ class qtmTODMath:
             The integer whole degrees in a floating point angle
         '''
 
-        return int(angle)
+        degrees, _, _ = _angle_DMS(angle)
+
+        return degrees
 
     def get_angle_minutes(self, angle):
         '''
@@ -1175,8 +1729,9 @@ class qtmTODMath:
             The integer minutes in a floating point angle
         '''
 
-        fracAng = angle - self.get_angle_degrees(angle)
-        return int(fracAng * 60.0)
+        _, minutes, _ = _angle_DMS(angle)
+
+        return minutes
 
     def get_angle_seconds(self, angle):
         '''
@@ -1192,9 +1747,27 @@ class qtmTODMath:
             The integer whole seconds in a floating point angle
         '''
 
-        fracAng = angle - self.get_angle_degrees(angle)
-        fracAng -= self.get_angle_minutes(angle) / 60.0
-        return int(fracAng * 3600.0)
+        _, _, seconds = _angle_DMS(angle)
+
+        return seconds
+
+    def get_angle_DMS(self, angle):
+        '''
+        Get the whole (integer) degrees, minutes and seconds in a supplied
+        angle together, the same values as get_angle_degrees(),
+        get_angle_minutes() and get_angle_seconds() return
+
+        Parameters
+        ----------
+            angle: a floating point angle in degrees
+
+        Returns
+        -------
+            A tuple of the integer degrees, minutes and seconds in a floating
+            point angle
+        '''
+
+        return _angle_DMS(angle)
 
     def get_DMS_angle_float(self, degrees, minutes, seconds):
         '''
@@ -1279,7 +1852,8 @@ class qtmTODMath:
                 outside that range are ignored
         '''
 
-        if (newLat >= -90.0) and (newLat <= 90.0):
+        # NaN fails the comparison, as do infinities, so they're ignored too
+        if -90.0 <= newLat <= 90.0:
             self.HomeLat = newLat
 
     def get_longitude(self):
@@ -1328,7 +1902,8 @@ class qtmTODMath:
                 outside that range are ignored
         '''
 
-        if (newLon >= -180.0) and (newLon <= 180.0):
+        # NaN fails the comparison, as do infinities, so they're ignored too
+        if -180.0 <= newLon <= 180.0:
             self.HomeLong = newLon
 
     def set_system_time(self):
@@ -1352,17 +1927,19 @@ class qtmTODMath:
         timezone offset in seconds
         '''
 
-        if tzOffset < 86400.0:
-            self.HomeTZ = 1.0 * tzOffset
-            self.HomeTZ /= 3600.0
+        # Less than a day either way. NaN fails the comparison, as do
+        # infinities, so they're ignored too
+        if -86400.0 < tzOffset < 86400.0:
+            self.HomeTZ = tzOffset / 3600.0
 
     def set_local_TZ(self):
         '''
         Set the class instance's local timezome from system time
         '''
 
-        self.HomeTZ = 1.0 * self.systemTime.tm_gmtoff
-        self.HomeTZ /= 3600.0
+        # Read the offset now, not from an earlier snapshot of the system
+        # time, so a daylight saving change in a running meter is followed
+        self.HomeTZ = self.__system_gmtoff(time.time()) / 3600.0
 
         # print("TZ: {}".format(HomeTZ))
 
@@ -2377,6 +2377,12 @@ class QtMeter(QDialog):
                 # Mis-matched FFT bin and frequency counts, we'll try using the
                 # apparent source frequency bins
                 # qCDebug(self.logCategory, "Source has {} bins, {} frequencies, step is {} Hz, Nyquist {}Hz".format(srcnBins, srcnFreqs, srcfStep, self.nyquistFrequency))
+            else:
+                # A frequency for every bin, from 0Hz to the Nyquist frequency.
+                # Index 0 is the data sum so we don't use it
+                srcfBins = srcfBins[1:]
+                srcFreqBins = srcFreqBins[1:]
+                srcnBins = srcfBins.size
 
             # binMax = numpy.max(srcfBins)
             # qCDebug(self.logCategory, "Max after slice is {}".format(binMax))
@@ -3915,6 +3921,12 @@ class QtMeter(QDialog):
             curFilterHighF = dlgConfig.audio_filter_high_frequency
             curFilterOrder = dlgConfig.audio_filter_order
 
+            # The dialog gives -1 for a frequency the filter type doesn't use,
+            # keep the previous one so it isn't stored as a frequency
+            if curFilterLowF == -1:
+                curFilterLowF = self.audioFilterLowF
+            if curFilterHighF == -1:
+                curFilterHighF = self.audioFilterHighF
 
         # Store new filter if anything changed
         cChange = False